@@ -7,8 +7,8 @@ import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent))
 
+from sqlalchemy import func
 from src.storage import DataStorage, ElectricianDB
-from src.models import Electrician
 from datetime import datetime
 
 # These are REAL records scraped from JustDial with verifiable URLs
@@ -86,17 +86,8 @@ def main():
     print("🎯 Source: JustDial (scraped with verification URLs)")
     print("=" * 70)
     
-    storage = DataStorage()
-    
-    # Clear old Surat data
-    print("\n🗑️  Clearing previous Surat data...")
-    session = storage.Session()
-    deleted = session.query(ElectricianDB).filter(
-        ElectricianDB.city.ilike('%surat%')
-    ).delete(synchronize_session=False)
-    session.commit()
-    session.close()
-    print(f"   Removed {deleted} old records")
+    storage = DataStorage(bulk_load=True)
+    storage.create_missing_indexes()
     
     # Display verified records
     print("\n📋 VERIFIED RECORDS (with clickable source URLs):")
@@ -111,30 +102,32 @@ def main():
     
     # Add to database
     print("\n" + "-" * 70)
-    print("💾 Adding to database...")
+    print("💾 Replacing Surat data in database...")
     
-    electricians = []
-    for r in VERIFIED_SURAT_ELECTRICIANS:
-        electricians.append(Electrician(
-            name=r['name'],
-            phone=r['phone'],
-            city='Surat',
-            state='Gujarat',
-            address=r['address'],
-            rating=r.get('rating'),
-            services=r['services'],
-            source=r['source'],
-            source_url=r['source_url']
-        ))
+    rows = [
+        {
+            'name': r['name'],
+            'phone': r['phone'],
+            'city': 'Surat',
+            'state': 'Gujarat',
+            'address': r['address'],
+            'rating': r.get('rating'),
+            'services': r['services'],
+            'source': r['source'],
+            'source_url': r['source_url'],
+        }
+        for r in VERIFIED_SURAT_ELECTRICIANS
+    ]
     
-    saved = storage.save_to_database(electricians)
+    # Clear old Surat data and insert in one transaction
+    deleted, saved = storage.replace_city_records('Surat', rows)
     
+    print(f"   Removed {deleted} old records")
     print(f"\n✅ Added {saved} verified records")
     
     # Show final count
-    session = storage.Session()
-    total = session.query(ElectricianDB).filter(ElectricianDB.city.ilike('%surat%')).count()
-    session.close()
+    with storage.Session() as session:
+        total = session.query(ElectricianDB).filter(func.lower(ElectricianDB.city) == 'surat').count()
     
     print("\n" + "=" * 70)
     print(f"📊 SURAT DATABASE: {total} VERIFIED RECORDS")
@@ -6,110 +6,156 @@ import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent))
 
-import requests
-from bs4 import BeautifulSoup
+from selectolax.lexbor import LexborHTMLParser
 import re
 import time
 import random
 import csv
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from sqlalchemy import func
+from src.scrapers import RATING_NUM_RE, create_session, has_phone_hint
 from src.storage import DataStorage, ElectricianDB
-from src.models import Electrician
 
 OUTPUT_DIR = Path(__file__).parent / "output"
 OUTPUT_DIR.mkdir(exist_ok=True)
 
-def get_headers():
-    return {
-        "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-        "Accept-Language": "en-US,en;q=0.9",
-    }
+# Patterns compiled once instead of per card
+_PHONE_RE = re.compile(r'[6-9]\d{9}')
+
+# CSS selectors for JustDial store cards (matched in C by selectolax)
+_CARD_SELECTOR = 'li[class*="cntanr"]'
+_CARD_FALLBACK_SELECTOR = 'div[class*="resultbox"], div[class*="jsx-"]'
+_NAME_LINK_SELECTOR = 'a[class*="lng_cont_name"], a[class*="store-name"]'
+_NAME_SPAN_SELECTOR = 'span[class*="lng_cont_name"], span[class*="store-name"]'
+_ADDR_SELECTOR = 'span[class*="cont_fl_addr"], span[class*="mrehspscrol"]'
+_RATING_SELECTOR = 'span[class*="green-box"], span[class*="rating"]'
+_TEL_LINK_SELECTOR = 'a[href^="tel:"]'
+# "tel" only as a whole class token; as a substring it also matches hotel-name etc.
+_PHONE_ELEM_SELECTOR = '[class*="contact"], [class*="phone"], [class~="tel"]'
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+}
+
+# One pooled session so all category pages reuse one connection. requests
+# already sends Accept-Encoding: gzip, deflate (plus br when brotli is installed)
+SESSION = create_session(HEADERS, pool_connections=4, pool_maxsize=8)
 
 def extract_phone(text):
-    """Extract valid Indian phone numbers."""
-    phones = set()
-    for m in re.findall(r'[6-9]\d{9}', text):
-        if len(set(m)) >= 4:  # Not fake like 9999999999
-            phones.add(m)
-    return list(phones)
+    """Return the first valid Indian phone number in text, or None."""
+    for m in _PHONE_RE.finditer(text):
+        phone = m.group()
+        if len(set(phone)) >= 4:  # Not fake like 9999999999
+            return phone
+    return None
 
-def scrape_justdial_page(url, category):
-    """Scrape a single JustDial page."""
-    results = []
+def find_card_phone(card):
+    """Find a card's phone in its tel: link or contact element, else in the full card text."""
+    tel_link = card.css_first(_TEL_LINK_SELECTOR)
+    if tel_link:
+        digits = ''.join(filter(str.isdigit, tel_link.attributes.get('href') or ''))
+        phone = extract_phone(digits[-10:])
+        if phone:
+            return phone
+    
+    phone_elem = card.css_first(_PHONE_ELEM_SELECTOR)
+    if phone_elem:
+        phone = extract_phone(phone_elem.text())
+        if phone:
+            return phone
     
+    return extract_phone(card.text())
+
+def fetch_justdial_page(url):
+    """
+    Fetch a single JustDial page. Returns the response, or None if the page
+    failed, was blocked, or has no phone numbers to parse.
+    """
     print(f"\n🌐 Scraping: {url}")
     
     try:
-        response = requests.get(url, headers=get_headers(), timeout=30)
-        if response.status_code != 200:
-            print(f"   ❌ Status {response.status_code}")
-            return results
-        
-        soup = BeautifulSoup(response.text, 'lxml')
+        response = SESSION.get(url, timeout=30)
+    except Exception as e:
+        print(f"   ❌ Error: {e}")
+        return None
+    
+    if response.status_code != 200:
+        print(f"   ❌ Status {response.status_code}")
+        return None
+    
+    if not has_phone_hint(response.content):
+        print("   ⚠️  No phone numbers on page")
+        return None
+    
+    return response
+
+def parse_justdial_page(response, url, category, seen):
+    """
+    Parse a fetched JustDial page into seen, a dict of records keyed by phone.
+    Phones already in seen are skipped. Returns the number of new records.
+    """
+    added = 0
+    
+    try:
+        tree = LexborHTMLParser(response.text)
         
         # Find all store cards
-        cards = soup.find_all('li', class_=re.compile(r'cntanr'))
+        cards = tree.css(_CARD_SELECTOR)
         if not cards:
-            cards = soup.find_all('div', class_=re.compile(r'resultbox|jsx-'))
-        
-        seen_phones = set()
+            cards = tree.css(_CARD_FALLBACK_SELECTOR)
         
         for card in cards:
             try:
                 # Get the main link and name
-                name_link = card.find('a', class_=re.compile(r'lng_cont_name|store-name'))
+                name_link = card.css_first(_NAME_LINK_SELECTOR)
                 if not name_link:
-                    name_link = card.find('span', class_=re.compile(r'lng_cont_name|store-name'))
+                    name_link = card.css_first(_NAME_SPAN_SELECTOR)
                 
                 if not name_link:
                     continue
                 
-                name = name_link.get_text(strip=True)
+                name = name_link.text(strip=True)
                 if len(name) < 3:
                     continue
                 
                 # Get URL
                 detail_url = ""
-                if name_link.name == 'a' and name_link.get('href'):
-                    href = name_link.get('href')
+                if name_link.tag == 'a' and name_link.attributes.get('href'):
+                    href = name_link.attributes['href']
                     if href.startswith('/'):
                         detail_url = f"https://www.justdial.com{href}"
                     elif href.startswith('http'):
                         detail_url = href
                 
                 if not detail_url:
-                    link = card.find('a', href=True)
+                    link = card.css_first('a[href]')
                     if link:
-                        href = link.get('href', '')
+                        href = link.attributes.get('href') or ''
                         if href.startswith('/'):
                             detail_url = f"https://www.justdial.com{href}"
                 
-                # Get phone from text
-                text = card.get_text()
-                phones = extract_phone(text)
-                
-                if not phones:
-                    continue
+                # Get phone, scanning the smallest subtree that has it
+                phone = find_card_phone(card)
                 
-                phone = phones[0]
-                if phone in seen_phones:
+                if not phone or phone in seen:
                     continue
-                seen_phones.add(phone)
                 
                 # Get address
-                addr_elem = card.find('span', class_=re.compile(r'cont_fl_addr|mrehspscrol'))
-                address = addr_elem.get_text(strip=True)[:150] if addr_elem else "Surat, Gujarat"
+                addr_elem = card.css_first(_ADDR_SELECTOR)
+                address = addr_elem.text(strip=True)[:150] if addr_elem else "Surat, Gujarat"
                 
                 # Get rating
                 rating = None
-                rating_elem = card.find('span', class_=re.compile(r'green-box|rating'))
+                rating_elem = card.css_first(_RATING_SELECTOR)
                 if rating_elem:
-                    match = re.search(r'(\d+\.?\d*)', rating_elem.get_text())
+                    match = RATING_NUM_RE.search(rating_elem.text())
                     if match:
                         rating = float(match.group(1))
                 
-                results.append({
+                seen[phone] = {
                     'name': name,
                     'phone': phone,
                     'address': address,
@@ -117,18 +163,17 @@ def scrape_justdial_page(url, category):
                     'category': category,
                     'source': 'JustDial',
                     'source_url': detail_url or url
-                })
+                }
+                added += 1
                 
             except Exception:
                 continue
         
-        print(f"   ✅ Found {len(results)} unique records")
-        return results
+        return added
         
     except Exception as e:
-        print(f"   ❌ Error: {e}")
-        return results
-
+        print(f"   ❌ {category}: parse error: {e}")
+        return added
 
 def main():
     print("\n" + "=" * 70)
@@ -138,20 +183,11 @@ def main():
     print("🎯 Only adding verified records with source URLs")
     print("=" * 70)
     
-    storage = DataStorage()
+    storage = DataStorage(bulk_load=True)
+    storage.create_missing_indexes()
     
-    # Clear existing Surat data
-    print("\n🗑️  Clearing previous Surat sample data...")
-    session = storage.Session()
-    deleted = session.query(ElectricianDB).filter(
-        ElectricianDB.city.ilike('%surat%')
-    ).delete(synchronize_session=False)
-    session.commit()
-    print(f"   Removed {deleted} old records")
-    session.close()
-    
-    # Scrape categories
-    all_records = []
+    # Scrape categories, deduplicating by phone as records arrive
+    seen = {}
     
     categories = [
         ("https://www.justdial.com/Surat/Electricians", "Electrician"),
@@ -159,69 +195,72 @@ def main():
         ("https://www.justdial.com/Surat/House-Wiring-Contractors", "House Wiring"),
     ]
     
-    for url, cat in categories:
-        records = scrape_justdial_page(url, cat)
-        all_records.extend(records)
-        time.sleep(random.uniform(2, 4))
+    # Fetch pages serially (one host, polite delays) and parse each one on a
+    # worker thread while the next delay and fetch run. A single worker keeps
+    # parses in category order, so deduplication matches a serial run.
+    parses = []
+    with ThreadPoolExecutor(max_workers=1) as parser:
+        for i, (url, cat) in enumerate(categories):
+            if i:
+                time.sleep(random.uniform(2, 4))
+            response = fetch_justdial_page(url)
+            if response is not None:
+                parses.append((cat, parser.submit(parse_justdial_page, response, url, cat, seen)))
     
-    # Deduplicate by phone
-    seen = {}
-    for r in all_records:
-        if r['phone'] not in seen:
-            seen[r['phone']] = r
-    unique_records = list(seen.values())
+    for cat, parse in parses:
+        print(f"   ✅ {cat}: found {parse.result()} new unique records")
     
-    print(f"\n📊 Total unique verified records: {len(unique_records)}")
+    print(f"\n📊 Total unique verified records: {len(seen)}")
     
-    if unique_records:
-        # Print verification table
+    if seen:
+        # Print verification table, write the CSV and build DB records in one pass
         print("\n" + "=" * 70)
         print("📋 VERIFIED RECORDS FOR REVIEW")
         print("=" * 70)
         
-        for i, r in enumerate(unique_records, 1):
-            print(f"\n{i}. {r['name']}")
-            print(f"   📞 Phone: {r['phone']}")
-            print(f"   📍 Address: {r['address'][:50]}...")
-            print(f"   🔧 Category: {r['category']}")
-            if r['rating']:
-                print(f"   ⭐ Rating: {r['rating']}")
-            print(f"   🔗 Verify: {r['source_url'][:60]}...")
-        
-        # Save to CSV for verification
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         csv_path = OUTPUT_DIR / f"surat_verified_clean_{timestamp}.csv"
+        rows = []
         
         with open(csv_path, 'w', newline='', encoding='utf-8') as f:
             writer = csv.DictWriter(f, fieldnames=['name', 'phone', 'address', 'rating', 'category', 'source', 'source_url'])
             writer.writeheader()
-            writer.writerows(unique_records)
+            
+            for i, r in enumerate(seen.values(), 1):
+                print(f"\n{i}. {r['name']}")
+                print(f"   📞 Phone: {r['phone']}")
+                print(f"   📍 Address: {r['address'][:50]}...")
+                print(f"   🔧 Category: {r['category']}")
+                if r['rating']:
+                    print(f"   ⭐ Rating: {r['rating']}")
+                print(f"   🔗 Verify: {r['source_url'][:60]}...")
+                
+                writer.writerow(r)
+                rows.append({
+                    'name': r['name'],
+                    'phone': r['phone'],
+                    'city': 'Surat',
+                    'state': 'Gujarat',
+                    'address': r['address'],
+                    'rating': r['rating'],
+                    'services': [r['category']],
+                    'source': r['source'],
+                    'source_url': r['source_url'],
+                })
         
         print(f"\n📁 CSV saved: {csv_path}")
         
         # Add to database
-        print("\n💾 Adding to database...")
-        electricians = []
-        for r in unique_records:
-            electricians.append(Electrician(
-                name=r['name'],
-                phone=r['phone'],
-                city='Surat',
-                state='Gujarat',
-                address=r['address'],
-                rating=r['rating'],
-                services=[r['category']],
-                source=r['source'],
-                source_url=r['source_url']
-            ))
+        print("\n💾 Replacing Surat data in database...")
         
-        saved = storage.save_to_database(electricians)
+        # Clear previous Surat sample data and insert in one transaction
+        deleted, saved = storage.replace_city_records('Surat', rows)
+        print(f"   Removed {deleted} old records")
         print(f"✅ Added {saved} verified records to database")
         
         # Final stats
-        session = storage.Session()
-        total = session.query(ElectricianDB).filter(ElectricianDB.city.ilike('%surat%')).count()
-        session.close()
+        with storage.Session() as session:
+            total = session.query(ElectricianDB).filter(func.lower(ElectricianDB.city) == 'surat').count()
         
         print("\n" + "=" * 70)
         print(f"✅ DATABASE NOW HAS {total} VERIFIED SURAT RECORDS")
@@ -7,154 +7,253 @@ import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+from sqlalchemy import case, func
 from src.storage import DataStorage, ElectricianDB
-import json
-import re
+import orjson
+from functools import lru_cache
 
+try:
+    import ahocorasick
+    HAS_AHOCORASICK = True
+except ImportError:
+    HAS_AHOCORASICK = False
 
-def categorize_business(name: str, services: list = None) -> tuple:
-    """
-    Categorize a business based on name and services.
-    Returns (category, description, smart_meter_score, notes)
-    """
-    name_lower = name.lower() if name else ''
-    services_text = ' '.join(services or []).lower()
-    combined = f"{name_lower} {services_text}"
-    
-    # Default values
-    category = "Electrician"
-    description = ""
-    score = 50
-    notes = ""
-    
+
+# Category rules in priority order; the first rule with a keyword in the text wins.
+# Each payload is (category, description, smart_meter_score, notes).
+CATEGORY_RULES = [
     # Meter Installation - Highest priority for smart meter work
-    if any(word in combined for word in ['meter', 'metering', 'prepaid', 'energy meter', 'utility']):
-        category = "Meter Installer"
-        description = "Specializes in energy meter installation and maintenance"
-        score = 95
-        notes = "High fit - Direct experience with meter installation. Likely familiar with utility requirements and protocols."
-    
+    (('meter', 'metering', 'prepaid', 'energy meter', 'utility'), (
+        "Meter Installer",
+        "Specializes in energy meter installation and maintenance",
+        95,
+        "High fit - Direct experience with meter installation. Likely familiar with utility requirements and protocols.",
+    )),
     # Electrical Contractors - Good for smart meter projects
-    elif any(word in combined for word in ['contractor', 'contracting', 'project', 'turnkey', 'commercial']):
-        category = "Electrical Contractor"
-        description = "Electrical contracting and project work"
-        score = 80
-        notes = "Good fit - Contractors often handle utility-scale projects and can manage smart meter rollouts."
-    
+    (('contractor', 'contracting', 'project', 'turnkey', 'commercial'), (
+        "Electrical Contractor",
+        "Electrical contracting and project work",
+        80,
+        "Good fit - Contractors often handle utility-scale projects and can manage smart meter rollouts.",
+    )),
     # Industrial Electricians - Strong technical background
-    elif any(word in combined for word in ['industrial', 'factory', 'plant', 'manufacturing', 'hv', 'high voltage']):
-        category = "Industrial Electrician"
-        description = "Industrial electrical systems and high-voltage work"
-        score = 75
-        notes = "Good fit - Strong technical skills for complex installations. May need training on specific meter models."
-    
+    (('industrial', 'factory', 'plant', 'manufacturing', 'hv', 'high voltage'), (
+        "Industrial Electrician",
+        "Industrial electrical systems and high-voltage work",
+        75,
+        "Good fit - Strong technical skills for complex installations. May need training on specific meter models.",
+    )),
     # Electrical Engineers / Consultants
-    elif any(word in combined for word in ['engineer', 'consultant', 'solution', 'technical']):
-        category = "Electrical Contractor"
-        description = "Electrical engineering and consulting services"
-        score = 70
-        notes = "Moderate fit - Technical knowledge is strong but may focus more on design than installation."
-    
+    (('engineer', 'consultant', 'solution', 'technical'), (
+        "Electrical Contractor",
+        "Electrical engineering and consulting services",
+        70,
+        "Moderate fit - Technical knowledge is strong but may focus more on design than installation.",
+    )),
     # AC/HVAC Electricians
-    elif any(word in combined for word in ['ac ', 'air condition', 'hvac', 'cooling', 'refrigeration']):
-        category = "AC Electrician"
-        description = "Air conditioning and HVAC electrical work"
-        score = 45
-        notes = "Lower fit - Specialized in HVAC systems. Would need training for meter installation."
-    
+    (('ac ', 'air condition', 'hvac', 'cooling', 'refrigeration'), (
+        "AC Electrician",
+        "Air conditioning and HVAC electrical work",
+        45,
+        "Lower fit - Specialized in HVAC systems. Would need training for meter installation.",
+    )),
     # Solar/Renewable
-    elif any(word in combined for word in ['solar', 'renewable', 'panel', 'photovoltaic', 'inverter']):
-        category = "Solar Installation"
-        description = "Solar panel and renewable energy installation"
-        score = 70
-        notes = "Good fit - Experience with grid connections and metering for net metering. Familiar with utility requirements."
-    
+    (('solar', 'renewable', 'panel', 'photovoltaic', 'inverter'), (
+        "Solar Installation",
+        "Solar panel and renewable energy installation",
+        70,
+        "Good fit - Experience with grid connections and metering for net metering. Familiar with utility requirements.",
+    )),
     # House Wiring / Residential
-    elif any(word in combined for word in ['house', 'home', 'residential', 'domestic', 'wiring', 'rewiring']):
-        category = "House Wiring"
-        description = "Residential wiring and electrical repairs"
-        score = 55
-        notes = "Moderate fit - Basic electrical skills but may need training on smart meter protocols."
-    
+    (('house', 'home', 'residential', 'domestic', 'wiring', 'rewiring'), (
+        "House Wiring",
+        "Residential wiring and electrical repairs",
+        55,
+        "Moderate fit - Basic electrical skills but may need training on smart meter protocols.",
+    )),
     # Lineman / Utility Workers
-    elif any(word in combined for word in ['lineman', 'linemen', 'line work', 'utility', 'power line']):
-        category = "Electrical Lineman"
-        description = "Power line installation and maintenance"
-        score = 85
-        notes = "High fit - Experienced with utility infrastructure. Ideal for meter installation at service points."
+    (('lineman', 'linemen', 'line work', 'utility', 'power line'), (
+        "Electrical Lineman",
+        "Power line installation and maintenance",
+        85,
+        "High fit - Experienced with utility infrastructure. Ideal for meter installation at service points.",
+    )),
+]
+
+# General Electricians
+DEFAULT_CATEGORY = (
+    "Electrician",
+    "General electrical services and repairs",
+    50,
+    "Moderate fit - General electrical experience. Training on smart meters would be required.",
+)
+
+# Score adjustments
+BOOST_CERT_KEYWORDS = ('certified', 'licensed', 'approved', 'authorized')
+BOOST_GOVT_KEYWORDS = ('government', 'govt', 'discom', 'utility approved')
+PENALTY_KEYWORDS = ('repair only', 'fan', 'light', 'appliance')
+
+# One flag bit per rule and adjustment, so one scan finds every matched group
+CATEGORY_MASK = (1 << len(CATEGORY_RULES)) - 1
+CATEGORY_PAYLOADS = [payload for _, payload in CATEGORY_RULES]
+BOOST_CERT = 1 << len(CATEGORY_RULES)
+BOOST_GOVT = BOOST_CERT << 1
+PENALTY = BOOST_GOVT << 1
+
+
+def _build_keyword_flags() -> dict:
+    """Map each keyword to the OR of the flag bits of every group containing it."""
+    groups = [(1 << i, keywords) for i, (keywords, _) in enumerate(CATEGORY_RULES)]
+    groups += [
+        (BOOST_CERT, BOOST_CERT_KEYWORDS),
+        (BOOST_GOVT, BOOST_GOVT_KEYWORDS),
+        (PENALTY, PENALTY_KEYWORDS),
+    ]
+    flags = {}
+    for bit, keywords in groups:
+        for keyword in keywords:
+            flags[keyword] = flags.get(keyword, 0) | bit
+    return flags
+
+
+KEYWORD_FLAGS = _build_keyword_flags()
+
+if HAS_AHOCORASICK:
+    KEYWORD_AUTOMATON = ahocorasick.Automaton()
+    for keyword, bits in KEYWORD_FLAGS.items():
+        KEYWORD_AUTOMATON.add_word(keyword, bits)
+    KEYWORD_AUTOMATON.make_automaton()
+else:
+    # Fallback: only search keywords whose first character is in the text
+    KEYWORDS_BY_FIRST_CHAR = {}
+    for keyword, bits in KEYWORD_FLAGS.items():
+        KEYWORDS_BY_FIRST_CHAR.setdefault(keyword[0], []).append((keyword, bits))
+
+
+def match_keyword_flags(text: str) -> int:
+    """Return the OR of the flag bits of every keyword found in text."""
+    flags = 0
+    if HAS_AHOCORASICK:
+        for _, bits in KEYWORD_AUTOMATON.iter(text):
+            flags |= bits
+    else:
+        for char in set(text).intersection(KEYWORDS_BY_FIRST_CHAR):
+            for keyword, bits in KEYWORDS_BY_FIRST_CHAR[char]:
+                if keyword in text:
+                    flags |= bits
+    return flags
+
+
+def categorize_business(name: str, services: list = None) -> tuple:
+    """
+    Categorize a business based on name and services.
+    Returns (category, description, smart_meter_score, notes)
+    """
+    name_lower = name.lower() if name else ''
+    services_text = ' '.join(services or []).lower()
+    return categorize_text(name_lower + " " + services_text)
+
+
+def categorize_text(combined: str) -> tuple:
+    """
+    Categorize a business from its lowercased name and services text.
+    Returns (category, description, smart_meter_score, notes)
+    """
+    flags = match_keyword_flags(combined)
     
-    # General Electricians
+    # Rule bits follow priority order, so the lowest set bit is the winning rule
+    rule_flags = flags & CATEGORY_MASK
+    if rule_flags:
+        payload = CATEGORY_PAYLOADS[(rule_flags & -rule_flags).bit_length() - 1]
     else:
-        category = "Electrician"
-        description = "General electrical services and repairs"
-        score = 50
-        notes = "Moderate fit - General electrical experience. Training on smart meters would be required."
+        payload = DEFAULT_CATEGORY
+    category, description, score, notes = payload
     
     # Boost score based on positive indicators
-    if any(word in combined for word in ['certified', 'licensed', 'approved', 'authorized']):
+    if flags & BOOST_CERT:
         score = min(score + 10, 100)
         notes += " Certified/licensed professional."
     
-    if any(word in combined for word in ['government', 'govt', 'discom', 'utility approved']):
+    if flags & BOOST_GOVT:
         score = min(score + 15, 100)
         notes += " Has government/utility experience."
     
     # Reduce score for potential issues
-    if any(word in combined for word in ['repair only', 'fan', 'light', 'appliance']):
+    if flags & PENALTY:
         score = max(score - 15, 10)
         notes += " May focus on small repairs."
     
     return category, description, score, notes
 
 
+CHUNK_SIZE = 500
+
+
+@lru_cache(maxsize=1024)
+def services_text(services_json: str) -> str:
+    """
+    Lowercased, space-joined services from a stored services value.
+    Records share a small set of services lists, so each is parsed once.
+    """
+    if not services_json:
+        return ''
+    try:
+        services = orjson.loads(services_json)
+    except (orjson.JSONDecodeError, TypeError):
+        services = None
+    if not isinstance(services, list):
+        # Not a JSON list, so treat the raw value as a single service
+        services = [services_json]
+    return ' '.join(str(s) for s in services).lower()
+
+
 def update_records():
     """Update all records with categories and smart meter scores."""
     storage = DataStorage()
+    storage.create_missing_indexes()
     session = storage.Session()
     
     try:
-        # Get all records
-        records = session.query(ElectricianDB).all()
-        print(f"Processing {len(records)} records...")
+        total = session.query(func.count(ElectricianDB.id)).scalar()
+        print(f"Processing {total} records...")
         
         updated = 0
-        for record in records:
-            # Parse services
-            services = []
-            if record.services:
-                try:
-                    services = json.loads(record.services)
-                except:
-                    services = [record.services]
-            
-            # Get categorization
-            category, description, score, notes = categorize_business(
-                record.name, 
-                services
-            )
+        last_id = 0
+        while True:
+            # Page through by id so memory stays flat and each chunk can commit
+            # The database lowercases names as it returns them
+            records = session.query(
+                ElectricianDB.id, func.lower(ElectricianDB.name), ElectricianDB.services
+            ).filter(ElectricianDB.id > last_id).order_by(ElectricianDB.id).limit(CHUNK_SIZE).all()
+            if not records:
+                break
             
-            # Update record
-            record.category = category
-            record.service_description = description
-            record.smart_meter_score = score
-            record.smart_meter_notes = notes
+            updates = []
+            for record_id, name_lower, services_json in records:
+                # Get categorization
+                combined = (name_lower or '') + " " + services_text(services_json)
+                category, description, score, notes = categorize_text(combined)
+                
+                updates.append({
+                    'id': record_id,
+                    'category': category,
+                    'service_description': description,
+                    'smart_meter_score': score,
+                    'smart_meter_notes': notes,
+                })
+                updated += 1
+                if updated % 50 == 0:
+                    print(f"  Processed {updated} records...")
             
-            updated += 1
-            if updated % 50 == 0:
-                print(f"  Processed {updated} records...")
+            # Write the chunk as one executemany UPDATE keyed by id
+            session.bulk_update_mappings(ElectricianDB, updates)
+            session.commit()
+            last_id = records[-1][0]
         
-        # Commit changes
-        session.commit()
         print(f"\n✓ Updated {updated} records with categories and smart meter scores")
         
         # Print summary
         print("\nCategory Distribution:")
-        categories = session.query(
-            ElectricianDB.category,
-            session.query(ElectricianDB).filter(ElectricianDB.category == ElectricianDB.category).count()
-        ).group_by(ElectricianDB.category).all()
-        
-        from sqlalchemy import func
         cat_counts = session.query(
             ElectricianDB.category,
             func.count(ElectricianDB.id)
@@ -164,12 +263,16 @@ def update_records():
             print(f"  {cat}: {count}")
         
         print("\nSmart Meter Score Distribution:")
-        high_fit = session.query(ElectricianDB).filter(ElectricianDB.smart_meter_score >= 70).count()
-        medium_fit = session.query(ElectricianDB).filter(
-            ElectricianDB.smart_meter_score >= 40,
-            ElectricianDB.smart_meter_score < 70
-        ).count()
-        low_fit = session.query(ElectricianDB).filter(ElectricianDB.smart_meter_score < 40).count()
+        # Bucket scores in one scan; NULL scores fall in no bucket, as before
+        fit = case(
+            (ElectricianDB.smart_meter_score >= 70, 'high'),
+            (ElectricianDB.smart_meter_score >= 40, 'medium'),
+            (ElectricianDB.smart_meter_score < 40, 'low'),
+        ).label('fit')
+        fit_counts = dict(session.query(fit, func.count()).group_by(fit).all())
+        high_fit = fit_counts.get('high', 0)
+        medium_fit = fit_counts.get('medium', 0)
+        low_fit = fit_counts.get('low', 0)
         
         print(f"  High Fit (>=70): {high_fit}")
         print(f"  Medium Fit (40-69): {medium_fit}")
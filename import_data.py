@@ -4,57 +4,51 @@ Import data from JSON export to database.
 Usage: python import_data.py <json_file>
 """
 import sys
-import json
+import orjson
 from datetime import datetime
-from src.storage import DataStorage, ElectricianDB
+from src.storage import DataStorage
 
 def import_from_json(json_file):
     """Import records from JSON file."""
-    with open(json_file, 'r') as f:
-        data = json.load(f)
+    with open(json_file, 'rb') as f:
+        data = orjson.loads(f.read())
     
     storage = DataStorage()
-    session = storage.Session()
+    now = datetime.now()
     
-    added = 0
-    skipped = 0
+    # phone is NOT NULL and part of the generated unique_key, so records
+    # without one are skipped instead of failing the whole import
+    rows = [
+        {
+            'name': record.get('name'),
+            'phone': record.get('phone'),
+            'city': record.get('city'),
+            'state': record.get('state'),
+            'address': record.get('address'),
+            'rating': record.get('rating'),
+            'review_count': record.get('review_count'),
+            'source': record.get('source'),
+            'source_url': record.get('source_url'),
+            'verified': record.get('verified', False),
+            'category': record.get('category'),
+            'service_description': record.get('service_description'),
+            'smart_meter_score': record.get('smart_meter_score', 0),
+            'unique_key': record.get('unique_key'),
+            'scraped_at': now,
+        }
+        for record in data
+        if record.get('phone')
+    ]
+    no_phone = len(data) - len(rows)
     
-    for record in data:
-        # Check if record already exists
-        existing = session.query(ElectricianDB).filter(
-            ElectricianDB.unique_key == record.get('unique_key')
-        ).first()
-        
-        if existing:
-            skipped += 1
-            continue
-        
-        # Create new record
-        new_record = ElectricianDB(
-            name=record.get('name'),
-            phone=record.get('phone'),
-            city=record.get('city'),
-            state=record.get('state'),
-            address=record.get('address'),
-            rating=record.get('rating'),
-            review_count=record.get('review_count'),
-            source=record.get('source'),
-            source_url=record.get('source_url'),
-            verified=record.get('verified', False),
-            category=record.get('category'),
-            service_description=record.get('service_description'),
-            smart_meter_score=record.get('smart_meter_score', 0),
-            unique_key=record.get('unique_key'),
-            scraped_at=datetime.now()
-        )
-        
-        session.add(new_record)
-        added += 1
-    
-    session.commit()
-    session.close()
+    # The unique index on unique_key skips records that already exist, in the
+    # database or earlier in the file, inside one transaction
+    added = storage.bulk_insert_dicts(rows)
+    skipped = len(data) - added
     
     print(f'Import complete: {added} added, {skipped} skipped')
+    if no_phone:
+        print(f'  ({no_phone} of the skipped records had no phone)')
     return added, skipped
 
 if __name__ == '__main__':
@@ -6,9 +6,10 @@ Coordinates all scrapers and manages data collection across states and cities.
 import argparse
 import logging
 import sys
+import threading
 from datetime import datetime
 from typing import List, Dict, Optional
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor
 from tqdm import tqdm
 
 from src.config import INDIAN_LOCATIONS, OUTPUT_DIR, LOG_DIR
@@ -56,6 +57,11 @@ class ScraperOrchestrator:
         self.storage = DataStorage()
         self.max_workers = max_workers
         
+        # Per-thread scraper instances for parallel runs
+        self._local = threading.local()
+        self._thread_scrapers = []
+        self._thread_scrapers_lock = threading.Lock()
+        
         # Initialize scrapers
         self.available_scrapers = {
             "google": GoogleMapsScraper,
@@ -65,21 +71,20 @@ class ScraperOrchestrator:
             "urbancompany": UrbanCompanyScraper,
         }
         
-        # Select scrapers to use
+        # Select scrapers to use; instances are created on first use
         if scrapers:
-            self.scrapers = {
-                name: cls() for name, cls in self.available_scrapers.items()
+            self.scraper_classes = {
+                name: cls for name, cls in self.available_scrapers.items()
                 if name in scrapers
             }
         else:
-            self.scrapers = {
-                name: cls() for name, cls in self.available_scrapers.items()
-            }
+            self.scraper_classes = dict(self.available_scrapers)
+        self.scrapers = {}
         
         # Select locations
         self.locations = self._select_locations(states, cities)
         
-        self.logger.info(f"Initialized with {len(self.scrapers)} scrapers")
+        self.logger.info(f"Initialized with {len(self.scraper_classes)} scrapers")
         self.logger.info(f"Will scrape {sum(len(cities) for cities in self.locations.values())} cities")
     
     def _select_locations(
@@ -110,14 +115,35 @@ class ScraperOrchestrator:
         
         return locations
     
+    def _get_scraper(self, scraper_name: str):
+        """Return the shared instance of a scraper, creating it on first use."""
+        scraper = self.scrapers.get(scraper_name)
+        if scraper is None and scraper_name in self.scraper_classes:
+            scraper = self.scrapers[scraper_name] = self.scraper_classes[scraper_name]()
+        return scraper
+    
+    def _get_thread_scraper(self, scraper_name: str):
+        """Return the calling thread's own instance of a scraper, creating it on first use."""
+        scrapers = getattr(self._local, "scrapers", None)
+        if scrapers is None:
+            scrapers = self._local.scrapers = {}
+        
+        scraper = scrapers.get(scraper_name)
+        if scraper is None and scraper_name in self.scraper_classes:
+            scraper = scrapers[scraper_name] = self.scraper_classes[scraper_name]()
+            with self._thread_scrapers_lock:
+                self._thread_scrapers.append(scraper)
+        return scraper
+    
     def _scrape_location(
         self,
         scraper_name: str,
         city: str,
         state: str,
+        scraper=None,
     ) -> ScrapeResult:
         """Scrape a single location with a specific scraper."""
-        scraper = self.scrapers.get(scraper_name)
+        scraper = scraper or self._get_scraper(scraper_name)
         if not scraper:
             return ScrapeResult(
                 success=False,
@@ -145,15 +171,16 @@ class ScraperOrchestrator:
         all_results = []
         
         total_tasks = sum(
-            len(cities) * len(self.scrapers)
+            len(cities) * len(self.scraper_classes)
             for cities in self.locations.values()
         )
         
-        with tqdm(total=total_tasks, desc="Scraping Progress") as pbar:
+        with tqdm(total=total_tasks, desc="Scraping Progress", mininterval=0.5) as pbar:
             for state, cities in self.locations.items():
                 for city in cities:
-                    for scraper_name in self.scrapers:
-                        pbar.set_description(f"{scraper_name}: {city}, {state}")
+                    for scraper_name in self.scraper_classes:
+                        # Shown on the next rate-limited refresh instead of forcing a repaint
+                        pbar.set_description(f"{scraper_name}: {city}, {state}", refresh=False)
                         
                         result = self._scrape_location(scraper_name, city, state)
                         all_results.append(result)
@@ -177,40 +204,30 @@ class ScraperOrchestrator:
         # Create list of all tasks
         for state, cities in self.locations.items():
             for city in cities:
-                for scraper_name in self.scrapers:
+                for scraper_name in self.scraper_classes:
                     tasks.append((scraper_name, city, state))
         
         with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            # Submit all tasks
-            futures = {
-                executor.submit(self._scrape_location, *task): task
-                for task in tasks
-            }
+            # Results stream back in task order, each thread using its own scrapers
+            results = executor.map(
+                lambda task: self._scrape_location(
+                    *task, scraper=self._get_thread_scraper(task[0])
+                ),
+                tasks,
+            )
             
-            # Process completed tasks
-            with tqdm(total=len(tasks), desc="Scraping Progress") as pbar:
-                for future in as_completed(futures):
-                    task = futures[future]
-                    try:
-                        result = future.result()
-                        all_results.append(result)
-                        
-                        if result.success and result.electricians:
+            with tqdm(total=len(tasks), desc="Scraping Progress", mininterval=0.5) as pbar:
+                for task, result in zip(tasks, results):
+                    all_results.append(result)
+                    
+                    if result.success and result.electricians:
+                        try:
                             saved = self.storage.save_to_database(result.electricians)
                             self.logger.info(
                                 f"Saved {saved} new electricians from {task[1]}, {task[2]}"
                             )
-                    except Exception as e:
-                        self.logger.error(f"Task {task} failed: {e}")
-                        all_results.append(
-                            ScrapeResult(
-                                success=False,
-                                source=task[0],
-                                city=task[1],
-                                state=task[2],
-                                error_message=str(e),
-                            )
-                        )
+                        except Exception as e:
+                            self.logger.error(f"Saving results for task {task} failed: {e}")
                     
                     pbar.update(1)
         
@@ -252,11 +269,17 @@ class ScraperOrchestrator:
     
     def export_results(self, format: str = "all") -> Dict[str, str]:
         """Export results to various formats."""
+        if format not in ("all", "csv", "json", "excel"):
+            raise ValueError(f"Unsupported export format: {format}")
+        
         exports = {}
         
+        # Load the records once and share them across every export format
+        electricians = self.storage.load_from_database()
+        
         if format in ["all", "csv"]:
             csv_path = self.storage.save_to_csv(
-                self.storage.load_from_database(),
+                electricians,
                 filename="electricians_export.csv",
                 append=False,
             )
@@ -265,7 +288,7 @@ class ScraperOrchestrator:
         
         if format in ["all", "json"]:
             json_path = self.storage.save_to_json(
-                self.storage.load_from_database(),
+                electricians,
                 filename="electricians_export.json",
                 append=False,
             )
@@ -274,7 +297,8 @@ class ScraperOrchestrator:
         
         if format in ["all", "excel"]:
             excel_path = self.storage.export_to_excel(
-                filename="electricians_export.xlsx"
+                filename="electricians_export.xlsx",
+                electricians=electricians,
             )
             exports["excel"] = excel_path
             self.logger.info(f"Exported to Excel: {excel_path}")
@@ -289,6 +313,8 @@ class ScraperOrchestrator:
         """Clean up resources."""
         for scraper in self.scrapers.values():
             scraper.close()
+        for scraper in self._thread_scrapers:
+            scraper.close()
 
 
 def main():
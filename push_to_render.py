@@ -2,78 +2,141 @@
 """
 Push local database records to Render's production database via API.
 """
+import argparse
 import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent))
 
-import requests
-import json
+import orjson
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from src.scrapers import create_session
 from src.storage import DataStorage, ElectricianDB
 
 RENDER_URL = "https://india-electricians-db-1.onrender.com"
+# Render runs gunicorn with 2 sync workers, so more concurrent batches only queue
+PUSH_WORKERS = 2
 
-def push_to_render():
+# Columns sent to the import API, selected as plain tuples rather than ORM objects
+PUSH_COLUMNS = (
+    ElectricianDB.name,
+    ElectricianDB.phone,
+    ElectricianDB.city,
+    ElectricianDB.state,
+    ElectricianDB.address,
+    ElectricianDB.rating,
+    ElectricianDB.review_count,
+    ElectricianDB.website,
+    ElectricianDB.source,
+    ElectricianDB.category,
+    ElectricianDB.verified,
+)
+
+def to_record(r):
+    """Convert a selected row to the JSON-serializable import format."""
+    return {
+        'name': r.name,
+        'phone': r.phone,
+        'city': r.city,
+        'state': r.state,
+        'address': r.address,
+        'rating': r.rating,
+        'review_count': r.review_count,
+        'website': r.website or '',
+        'source': r.source,
+        'category': r.category or '',
+        'verified': r.verified or False,
+    }
+
+def push_batch(http, batch):
+    """POST one batch to the import API. Returns (imported, skipped, status message)."""
+    try:
+        response = http.post(
+            f"{RENDER_URL}/api/import",
+            data=orjson.dumps({'records': batch}),
+            timeout=60
+        )
+        
+        if response.status_code == 200:
+            result = response.json()
+            imported, skipped = result.get('imported', 0), result.get('skipped', 0)
+            return imported, skipped, f"✅ Imported: {imported}, Skipped: {skipped}"
+        return 0, 0, f"❌ Error: {response.status_code} - {response.text}"
+    except Exception as e:
+        return 0, 0, f"❌ Error: {e}"
+
+def push_to_render(workers=PUSH_WORKERS):
     print("="*60)
     print("🚀 Pushing local data to Render")
     print("="*60)
     
     storage = DataStorage()
+    storage.create_missing_indexes()
     session = storage.Session()
     
     # Get all UP records from local database
-    records = session.query(ElectricianDB).filter(
+    query = session.query(*PUSH_COLUMNS).filter(
         ElectricianDB.state == 'Uttar Pradesh'
-    ).all()
-    
-    print(f"\n📊 Found {len(records)} records in local database for UP")
+    )
     
-    # Convert to JSON-serializable format
-    data = []
-    for r in records:
-        data.append({
-            'name': r.name,
-            'phone': r.phone,
-            'city': r.city,
-            'state': r.state,
-            'address': r.address,
-            'rating': r.rating,
-            'review_count': r.review_count,
-            'website': r.website or '',
-            'source': r.source,
-            'category': r.category or '',
-            'verified': r.verified or False,
-        })
+    print(f"\n📊 Found {query.count()} records in local database for UP")
     
-    session.close()
-    
-    # Push in batches
+    # Push batches concurrently while streaming rows; at most a few batches
+    # are in flight and results are reported in batch order
     batch_size = 100
     total_imported = 0
     total_skipped = 0
     
     print(f"\n📤 Pushing to {RENDER_URL}...")
     
-    for i in range(0, len(data), batch_size):
-        batch = data[i:i+batch_size]
-        print(f"  Batch {i//batch_size + 1}: {len(batch)} records...", end=" ")
-        
-        try:
-            response = requests.post(
-                f"{RENDER_URL}/api/import",
-                json={'records': batch},
-                headers={'Content-Type': 'application/json'},
-                timeout=60
-            )
+    # Pooled so concurrent batches reuse keep-alive connections. POSTs are
+    # safe to retry because the import skips phones it already has
+    http = create_session(
+        {'Content-Type': 'application/json'},
+        backoff_factor=0.5,
+        status_forcelist=(429, 502, 503, 504),
+        allowed_methods=frozenset({"POST"}),
+        pool_connections=1,
+        pool_maxsize=workers,
+    )
+    pending = deque()
+    batch_num = 0
+    
+    def report_oldest():
+        nonlocal batch_num, total_imported, total_skipped
+        size, future = pending.popleft()
+        imported, skipped, status = future.result()
+        batch_num += 1
+        total_imported += imported
+        total_skipped += skipped
+        print(f"  Batch {batch_num}: {size} records... {status}")
+    
+    # The server skips phones it already has; a repeated phone is skipped here
+    # instead so two concurrent batches never race to insert it
+    seen_phones = set()
+    batch = []
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for r in query.yield_per(batch_size):
+                if r.phone in seen_phones:
+                    total_skipped += 1
+                    continue
+                seen_phones.add(r.phone)
+                
+                batch.append(to_record(r))
+                if len(batch) == batch_size:
+                    pending.append((len(batch), executor.submit(push_batch, http, batch)))
+                    batch = []
+                    if len(pending) > workers * 2:
+                        report_oldest()
             
-            if response.status_code == 200:
-                result = response.json()
-                total_imported += result.get('imported', 0)
-                total_skipped += result.get('skipped', 0)
-                print(f"✅ Imported: {result.get('imported', 0)}, Skipped: {result.get('skipped', 0)}")
-            else:
-                print(f"❌ Error: {response.status_code} - {response.text}")
-        except Exception as e:
-            print(f"❌ Error: {e}")
+            if batch:
+                pending.append((len(batch), executor.submit(push_batch, http, batch)))
+            while pending:
+                report_oldest()
+    finally:
+        session.close()
+        http.close()
     
     print("\n" + "="*60)
     print("📊 IMPORT COMPLETE")
@@ -84,4 +147,12 @@ def push_to_render():
 
 
 if __name__ == "__main__":
-    push_to_render()
+    parser = argparse.ArgumentParser(description="Push local UP records to the Render database")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=PUSH_WORKERS,
+        help=f"Batches to send concurrently (default: {PUSH_WORKERS})",
+    )
+    args = parser.parse_args()
+    push_to_render(max(1, args.workers))
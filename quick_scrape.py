@@ -236,9 +236,8 @@ def add_sample_data():
         ("UP Electric Services", "9838222333", "Lucknow", "Uttar Pradesh", "Gomti Nagar", 4.3, 75, "indiamart"),
     ]
     
-    electricians = []
-    for name, phone, city, state, address, rating, reviews, source in sample_data:
-        electricians.append(Electrician(
+    electricians = [
+        Electrician(
             name=name,
             phone=phone,
             city=city,
@@ -247,7 +246,9 @@ def add_sample_data():
             rating=rating,
             review_count=reviews,
             source=source,
-        ))
+        )
+        for name, phone, city, state, address, rating, reviews, source in sample_data
+    ]
     
     saved = storage.save_to_database(electricians)
     print(f"✅ Added {saved} sample records to database")
@@ -17,6 +17,15 @@ from datetime import datetime
 OUTPUT_DIR = Path(__file__).parent / "output"
 OUTPUT_DIR.mkdir(exist_ok=True)
 
+def class_contains(*parts):
+    """Build a bs4 class_ matcher for classes containing any of parts."""
+    return lambda c: c is not None and any(p in c for p in parts)
+
+LISTING_CLASS = class_contains('cntanr', 'resultbox', 'jsx-', 'store')
+NAME_CLASS = class_contains('lng_cont', 'store-name', 'title', 'heading')
+ADDR_CLASS = class_contains('addr', 'mrehspscrol', 'area', 'location')
+RATING_CLASS = class_contains('green-box', 'rating', 'star')
+
 def get_headers():
     return {
         "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
@@ -52,7 +61,7 @@ def scrape_justdial():
         soup = BeautifulSoup(response.text, 'lxml')
         
         # Find all listing containers
-        listings = soup.find_all(['li', 'div'], class_=re.compile(r'cntanr|resultbox|jsx-|store'))
+        listings = soup.find_all(['li', 'div'], class_=LISTING_CLASS)
         
         print(f"📊 Found {len(listings)} potential listings\n")
         
@@ -65,7 +74,7 @@ def scrape_justdial():
                 continue
             
             # Get name
-            name_elem = listing.find(['a', 'span', 'h2'], class_=re.compile(r'lng_cont|store-name|title|heading'))
+            name_elem = listing.find(['a', 'span', 'h2'], class_=NAME_CLASS)
             if not name_elem:
                 name_elem = listing.find(['h2', 'h3', 'a'])
             
@@ -74,12 +83,12 @@ def scrape_justdial():
                 continue
             
             # Get address
-            addr_elem = listing.find(['span', 'p'], class_=re.compile(r'addr|mrehspscrol|area|location'))
+            addr_elem = listing.find(['span', 'p'], class_=ADDR_CLASS)
             address = addr_elem.get_text(strip=True)[:150] if addr_elem else "Surat"
             
             # Get rating
             rating = ""
-            rating_elem = listing.find('span', class_=re.compile(r'green-box|rating|star'))
+            rating_elem = listing.find('span', class_=RATING_CLASS)
             if rating_elem:
                 rating_match = re.search(r'(\d+\.?\d*)', rating_elem.get_text())
                 if rating_match:
@@ -12,6 +12,7 @@ import re
 import time
 import random
 import logging
+from sqlalchemy import text
 from src.models import Electrician
 from src.storage import DataStorage
 
@@ -20,6 +21,15 @@ logger = logging.getLogger(__name__)
 
 storage = DataStorage()
 
+# Surat stats queries, built once and reused with bind params across the keyword loops
+SURAT_COUNT = text("SELECT COUNT(*) FROM electricians WHERE LOWER(city) LIKE '%surat%'")
+SURAT_SERVICE_COUNT = text(
+    "SELECT COUNT(*) FROM electricians WHERE LOWER(city) LIKE '%surat%' AND LOWER(services) LIKE LOWER(:kw)"
+)
+SURAT_SOURCE_COUNT = text(
+    "SELECT COUNT(*) FROM electricians WHERE LOWER(city) LIKE '%surat%' AND source = :source"
+)
+
 USER_AGENTS = [
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 Chrome/120.0.0.0 Safari/537.36",
     "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 Chrome/120.0.0.0 Safari/537.36",
@@ -346,31 +356,22 @@ def main():
     print(f"\n✅ Total records in database: {stats['total_records']}")
     
     # Show Surat-specific stats
-    from src.storage import ElectricianDB
     session = storage.Session()
     try:
-        surat_count = session.query(ElectricianDB).filter(
-            ElectricianDB.city.ilike('%surat%')
-        ).count()
+        surat_count = session.execute(SURAT_COUNT).scalar()
         print(f"📍 Surat records: {surat_count}")
         
         # Count by service type
         print("\n📋 By Service Type:")
         for service in ["Electrician", "Meter Installer", "Electrical Lineman", "House Wiring", "Industrial", "Solar"]:
-            count = session.query(ElectricianDB).filter(
-                ElectricianDB.city.ilike('%surat%'),
-                ElectricianDB.services.ilike(f'%{service}%')
-            ).count()
+            count = session.execute(SURAT_SERVICE_COUNT, {"kw": f"%{service}%"}).scalar()
             if count > 0:
                 print(f"   {service}: {count}")
         
         # Count by source
         print("\n🌐 By Source:")
         for source in ["justdial", "indiamart", "sulekha"]:
-            count = session.query(ElectricianDB).filter(
-                ElectricianDB.city.ilike('%surat%'),
-                ElectricianDB.source == source
-            ).count()
+            count = session.execute(SURAT_SOURCE_COUNT, {"source": source}).scalar()
             if count > 0:
                 print(f"   {source}: {count}")
                 
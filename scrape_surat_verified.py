@@ -8,22 +8,25 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent))
 
 import requests
-from bs4 import BeautifulSoup
-import re
+from lxml import etree
 import time
 import random
-import json
+import orjson
 import csv
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from dataclasses import dataclass, asdict
-from typing import List, Optional
+from typing import List, NamedTuple, Optional
+
+from src.scrapers import RATING_NUM_RE, create_session, extract_phones, has_phone_hint
+from src.scrapers.html_utils import class_xpath, element_text, find_first, parse_page
 
 # Output files
 OUTPUT_DIR = Path(__file__).parent / "output"
 OUTPUT_DIR.mkdir(exist_ok=True)
 
-@dataclass
-class VerifiedElectrician:
+class VerifiedElectrician(NamedTuple):
+    """A scraped listing. A NamedTuple, so records carry no per-instance __dict__."""
     name: str
     phone: str
     address: str
@@ -42,36 +45,56 @@ USER_AGENTS = [
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
 ]
 
+# Static request headers, set once on the session
+BASE_HEADERS = {
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9,hi;q=0.8",
+    "Accept-Encoding": "gzip, deflate, br",
+    "Connection": "keep-alive",
+    "Cache-Control": "max-age=0",
+}
+
 def get_headers():
-    return {
-        "User-Agent": random.choice(USER_AGENTS),
-        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-        "Accept-Language": "en-US,en;q=0.9,hi;q=0.8",
-        "Accept-Encoding": "gzip, deflate, br",
-        "Connection": "keep-alive",
-        "Cache-Control": "max-age=0",
-    }
+    """Per-request headers; only the User-Agent varies, the rest come from BASE_HEADERS."""
+    return {"User-Agent": random.choice(USER_AGENTS)}
 
-def extract_indian_phone(text: str) -> List[str]:
-    """Extract valid Indian phone numbers."""
-    patterns = [
-        r'\+91[\s\-]?[6-9]\d{9}',
-        r'91[\s\-]?[6-9]\d{9}',
-        r'0[6-9]\d{9}',
-        r'[6-9]\d{9}',
-        r'[6-9]\d{4}[\s\-]?\d{5}',
-    ]
-    phones = set()
-    for pattern in patterns:
-        matches = re.findall(pattern, text)
-        for m in matches:
-            digits = re.sub(r'\D', '', m)
-            if len(digits) >= 10:
-                phone = digits[-10:]
-                # Validate: Indian mobile starts with 6-9
-                if phone[0] in '6789':
-                    phones.add(phone)
-    return list(phones)
+# Pooled, so repeat requests to each site reuse keep-alive connections. It backs
+# off only when a site signals overload; the last response goes to the status check
+SESSION = create_session(
+    BASE_HEADERS,
+    backoff_factor=2,
+    status_forcelist=(429, 502, 503),
+    raise_on_status=False,
+    pool_connections=8,
+    pool_maxsize=16,
+)
+
+LINK_XPATH = etree.XPath(".//a[@href]")
+
+JUSTDIAL_LISTING_XPATH = class_xpath(['li', 'div'], 'cntanr|resultbox|jsx-')
+JUSTDIAL_NAME_XPATH = class_xpath(['a', 'span', 'h2'], 'lng_cont_name|store-name|title')
+JUSTDIAL_NAME_FALLBACK_XPATH = class_xpath(['h2', 'h3', 'a'])
+JUSTDIAL_ADDR_XPATH = class_xpath(['span', 'p'], 'cont_fl_addr|address|area')
+JUSTDIAL_RATING_XPATH = class_xpath(['span'], 'green-box|rating|star')
+
+SULEKHA_LISTING_XPATH = class_xpath(['div', 'article'], 'vendor|card|listing|merchant')
+SULEKHA_NAME_XPATH = class_xpath(['h2', 'h3', 'a', 'span'], 'name|title|merchant')
+SULEKHA_ADDR_XPATH = class_xpath(['span', 'p', 'div'], 'address|location|area')
+
+INDIAMART_LISTING_XPATH = class_xpath(['div', 'li'], 'lst|card|company|lcname|prd-')
+INDIAMART_NAME_XPATH = class_xpath(['a', 'h2', 'h3', 'span'], 'lcname|company|pnm|title')
+INDIAMART_ADDR_XPATH = class_xpath(['span', 'p'], 'lcity|address|location')
+
+
+_log_buffer = threading.local()
+
+def log(message: str):
+    """Print a progress line, or buffer it while a site is scraped on a worker thread."""
+    lines = getattr(_log_buffer, "lines", None)
+    if lines is None:
+        print(message)
+    else:
+        lines.append(message)
 
 def is_valid_phone(phone: str) -> bool:
     """Validate Indian phone number."""
@@ -97,67 +120,94 @@ def is_valid_name(name: str) -> bool:
     return True
 
 
+def extract_listing_fields(listing, name_xpath, addr_xpath, name_fallback_xpath=None, rating_xpath=None):
+    """
+    Pull every field a scraper needs from one listing, running each compiled
+    XPath at most once. Returns (phones, name, address, rating, href), or None
+    as soon as the listing turns out to have no phone or no valid name.
+    """
+    phones = extract_phones(element_text(listing, ' ', strip=True))
+    if not phones:
+        return None
+    
+    name_elem = find_first(name_xpath, listing)
+    if name_elem is None and name_fallback_xpath is not None:
+        name_elem = find_first(name_fallback_xpath, listing)
+    name = element_text(name_elem, strip=True)[:100] if name_elem is not None else None
+    if not is_valid_name(name):
+        return None
+    
+    addr_elem = find_first(addr_xpath, listing)
+    address = element_text(addr_elem, strip=True)[:200] if addr_elem is not None else "Surat, Gujarat"
+    
+    rating = None
+    rating_elem = find_first(rating_xpath, listing) if rating_xpath is not None else None
+    if rating_elem is not None:
+        rating_match = RATING_NUM_RE.search(element_text(rating_elem, strip=True))
+        if rating_match:
+            rating = float(rating_match.group(1))
+    
+    link_elem = find_first(LINK_XPATH, listing)
+    href = link_elem.get('href', '') if link_elem is not None else ''
+    
+    return phones, name, address, rating, href
+
+
+def fetch_page(url: str):
+    """
+    Fetch a listing page after a polite pause. Returns the response, or None
+    if the page failed or has no phone numbers to parse.
+    """
+    time.sleep(random.uniform(2, 4))
+    # Only the User-Agent varies per request; the rest are session defaults
+    response = SESSION.get(url, headers=get_headers(), timeout=30)
+    
+    if response.status_code != 200:
+        log(f"   ❌ Status: {response.status_code}")
+        return None
+    
+    if not has_phone_hint(response.content):
+        log("   ⚠️  No phone numbers on page")
+        return None
+    
+    return response
+
+
 def scrape_justdial_surat(category: str, service_type: str) -> List[VerifiedElectrician]:
     """Scrape JustDial for Surat electricians."""
     results = []
     base_url = f"https://www.justdial.com/Surat/{category}"
     
-    print(f"\n📍 JustDial: {category}")
-    print(f"   URL: {base_url}")
+    log(f"\n📍 JustDial: {category}")
+    log(f"   URL: {base_url}")
     
     try:
-        time.sleep(random.uniform(2, 4))
-        response = requests.get(base_url, headers=get_headers(), timeout=30)
-        
-        if response.status_code != 200:
-            print(f"   ❌ Status: {response.status_code}")
+        response = fetch_page(base_url)
+        if response is None:
             return results
         
-        soup = BeautifulSoup(response.text, 'lxml')
+        doc = parse_page(response)
+        scraped_at = datetime.now().isoformat()  # one timestamp per page
         
         # JustDial uses various class patterns
-        listings = soup.find_all(['li', 'div'], class_=re.compile(r'cntanr|resultbox|jsx-'))
+        listings = JUSTDIAL_LISTING_XPATH(doc)
         
         for listing in listings:
             try:
-                text = listing.get_text(separator=' ', strip=True)
-                phones = extract_indian_phone(text)
-                
-                if not phones:
+                fields = extract_listing_fields(
+                    listing, JUSTDIAL_NAME_XPATH, JUSTDIAL_ADDR_XPATH,
+                    JUSTDIAL_NAME_FALLBACK_XPATH, JUSTDIAL_RATING_XPATH,
+                )
+                if fields is None:
                     continue
+                phones, name, address, rating, href = fields
                 
-                # Extract name
-                name_elem = listing.find(['a', 'span', 'h2'], class_=re.compile(r'lng_cont_name|store-name|title'))
-                if not name_elem:
-                    name_elem = listing.find(['h2', 'h3', 'a'])
-                
-                name = name_elem.get_text(strip=True)[:100] if name_elem else None
-                
-                if not is_valid_name(name):
-                    continue
-                
-                # Extract address
-                addr_elem = listing.find(['span', 'p'], class_=re.compile(r'cont_fl_addr|address|area'))
-                address = addr_elem.get_text(strip=True)[:200] if addr_elem else "Surat, Gujarat"
-                
-                # Extract rating
-                rating = None
-                rating_elem = listing.find(['span'], class_=re.compile(r'green-box|rating|star'))
-                if rating_elem:
-                    rating_text = rating_elem.get_text(strip=True)
-                    rating_match = re.search(r'(\d+\.?\d*)', rating_text)
-                    if rating_match:
-                        rating = float(rating_match.group(1))
-                
-                # Extract detail URL
-                link_elem = listing.find('a', href=True)
+                # Build detail URL
                 detail_url = ""
-                if link_elem:
-                    href = link_elem.get('href', '')
-                    if href.startswith('/'):
-                        detail_url = f"https://www.justdial.com{href}"
-                    elif href.startswith('http'):
-                        detail_url = href
+                if href.startswith('/'):
+                    detail_url = f"https://www.justdial.com{href}"
+                elif href.startswith('http'):
+                    detail_url = href
                 
                 for phone in phones[:1]:  # Take first valid phone
                     if is_valid_phone(phone):
@@ -170,18 +220,18 @@ def scrape_justdial_surat(category: str, service_type: str) -> List[VerifiedElec
                             source="JustDial",
                             source_url=detail_url or base_url,
                             verified=True,
-                            scraped_at=datetime.now().isoformat()
+                            scraped_at=scraped_at
                         ))
                         
             except Exception as e:
                 continue
         
-        print(f"   ✅ Found {len(results)} verified listings")
+        log(f"   ✅ Found {len(results)} verified listings")
         
     except requests.exceptions.RequestException as e:
-        print(f"   ❌ Request error: {e}")
+        log(f"   ❌ Request error: {e}")
     except Exception as e:
-        print(f"   ❌ Error: {e}")
+        log(f"   ❌ Error: {e}")
     
     return results
 
@@ -191,46 +241,31 @@ def scrape_sulekha_surat(category: str, service_type: str) -> List[VerifiedElect
     results = []
     base_url = f"https://www.sulekha.com/{category}/surat"
     
-    print(f"\n📍 Sulekha: {category}")
-    print(f"   URL: {base_url}")
+    log(f"\n📍 Sulekha: {category}")
+    log(f"   URL: {base_url}")
     
     try:
-        time.sleep(random.uniform(2, 4))
-        response = requests.get(base_url, headers=get_headers(), timeout=30)
-        
-        if response.status_code != 200:
-            print(f"   ❌ Status: {response.status_code}")
+        response = fetch_page(base_url)
+        if response is None:
             return results
         
-        soup = BeautifulSoup(response.text, 'lxml')
+        doc = parse_page(response)
+        scraped_at = datetime.now().isoformat()  # one timestamp per page
         
-        listings = soup.find_all(['div', 'article'], class_=re.compile(r'vendor|card|listing|merchant'))
+        listings = SULEKHA_LISTING_XPATH(doc)
         
         for listing in listings:
             try:
-                text = listing.get_text(separator=' ', strip=True)
-                phones = extract_indian_phone(text)
-                
-                if not phones:
-                    continue
-                
-                name_elem = listing.find(['h2', 'h3', 'a', 'span'], class_=re.compile(r'name|title|merchant'))
-                name = name_elem.get_text(strip=True)[:100] if name_elem else None
-                
-                if not is_valid_name(name):
+                fields = extract_listing_fields(listing, SULEKHA_NAME_XPATH, SULEKHA_ADDR_XPATH)
+                if fields is None:
                     continue
+                phones, name, address, _, href = fields
                 
-                addr_elem = listing.find(['span', 'p', 'div'], class_=re.compile(r'address|location|area'))
-                address = addr_elem.get_text(strip=True)[:200] if addr_elem else "Surat, Gujarat"
-                
-                link_elem = listing.find('a', href=True)
                 detail_url = ""
-                if link_elem:
-                    href = link_elem.get('href', '')
-                    if href.startswith('/'):
-                        detail_url = f"https://www.sulekha.com{href}"
-                    elif href.startswith('http'):
-                        detail_url = href
+                if href.startswith('/'):
+                    detail_url = f"https://www.sulekha.com{href}"
+                elif href.startswith('http'):
+                    detail_url = href
                 
                 for phone in phones[:1]:
                     if is_valid_phone(phone):
@@ -242,16 +277,16 @@ def scrape_sulekha_surat(category: str, service_type: str) -> List[VerifiedElect
                             source="Sulekha",
                             source_url=detail_url or base_url,
                             verified=True,
-                            scraped_at=datetime.now().isoformat()
+                            scraped_at=scraped_at
                         ))
                         
             except Exception as e:
                 continue
         
-        print(f"   ✅ Found {len(results)} verified listings")
+        log(f"   ✅ Found {len(results)} verified listings")
         
     except Exception as e:
-        print(f"   ❌ Error: {e}")
+        log(f"   ❌ Error: {e}")
     
     return results
 
@@ -261,44 +296,29 @@ def scrape_indiamart_surat(category: str, service_type: str) -> List[VerifiedEle
     results = []
     base_url = f"https://dir.indiamart.com/surat/{category}.html"
     
-    print(f"\n📍 IndiaMART: {category}")
-    print(f"   URL: {base_url}")
+    log(f"\n📍 IndiaMART: {category}")
+    log(f"   URL: {base_url}")
     
     try:
-        time.sleep(random.uniform(2, 4))
-        response = requests.get(base_url, headers=get_headers(), timeout=30)
-        
-        if response.status_code != 200:
-            print(f"   ❌ Status: {response.status_code}")
+        response = fetch_page(base_url)
+        if response is None:
             return results
         
-        soup = BeautifulSoup(response.text, 'lxml')
+        doc = parse_page(response)
+        scraped_at = datetime.now().isoformat()  # one timestamp per page
         
-        listings = soup.find_all(['div', 'li'], class_=re.compile(r'lst|card|company|lcname|prd-'))
+        listings = INDIAMART_LISTING_XPATH(doc)
         
         for listing in listings:
             try:
-                text = listing.get_text(separator=' ', strip=True)
-                phones = extract_indian_phone(text)
-                
-                if not phones:
-                    continue
-                
-                name_elem = listing.find(['a', 'h2', 'h3', 'span'], class_=re.compile(r'lcname|company|pnm|title'))
-                name = name_elem.get_text(strip=True)[:100] if name_elem else None
-                
-                if not is_valid_name(name):
+                fields = extract_listing_fields(listing, INDIAMART_NAME_XPATH, INDIAMART_ADDR_XPATH)
+                if fields is None:
                     continue
+                phones, name, address, _, href = fields
                 
-                addr_elem = listing.find(['span', 'p'], class_=re.compile(r'lcity|address|location'))
-                address = addr_elem.get_text(strip=True)[:200] if addr_elem else "Surat, Gujarat"
-                
-                link_elem = listing.find('a', href=True)
                 detail_url = ""
-                if link_elem:
-                    href = link_elem.get('href', '')
-                    if href.startswith('http'):
-                        detail_url = href
+                if href.startswith('http'):
+                    detail_url = href
                 
                 for phone in phones[:1]:
                     if is_valid_phone(phone):
@@ -310,27 +330,34 @@ def scrape_indiamart_surat(category: str, service_type: str) -> List[VerifiedEle
                             source="IndiaMART",
                             source_url=detail_url or base_url,
                             verified=True,
-                            scraped_at=datetime.now().isoformat()
+                            scraped_at=scraped_at
                         ))
                         
             except Exception as e:
                 continue
         
-        print(f"   ✅ Found {len(results)} verified listings")
+        log(f"   ✅ Found {len(results)} verified listings")
         
     except Exception as e:
-        print(f"   ❌ Error: {e}")
+        log(f"   ❌ Error: {e}")
     
     return results
 
 
-def deduplicate_by_phone(electricians: List[VerifiedElectrician]) -> List[VerifiedElectrician]:
-    """Remove duplicates based on phone number."""
-    seen = {}
-    for e in electricians:
-        if e.phone not in seen:
-            seen[e.phone] = e
-    return list(seen.values())
+def scrape_site(scrape_fn, categories) -> tuple:
+    """
+    Scrape one site's categories in order. Each scraper already waits before
+    its request, so no extra pause is added between categories.
+    Returns (electricians, buffered log lines).
+    """
+    _log_buffer.lines = []
+    results = []
+    try:
+        for cat, svc in categories:
+            results.extend(scrape_fn(cat, svc))
+        return results, _log_buffer.lines
+    finally:
+        _log_buffer.lines = None
 
 
 def save_to_csv(electricians: List[VerifiedElectrician], filename: str):
@@ -344,11 +371,11 @@ def save_to_csv(electricians: List[VerifiedElectrician], filename: str):
             'Service Type', 'Rating', 'Source', 'Source URL', 'Scraped At'
         ])
         
-        for e in electricians:
-            writer.writerow([
-                e.name, e.phone, e.address, e.city, e.state,
-                e.service_type, e.rating or '', e.source, e.source_url, e.scraped_at
-            ])
+        writer.writerows(
+            (e.name, e.phone, e.address, e.city, e.state,
+             e.service_type, e.rating or '', e.source, e.source_url, e.scraped_at)
+            for e in electricians
+        )
     
     print(f"\n📁 Saved to: {filepath}")
     return filepath
@@ -362,11 +389,11 @@ def save_to_json(electricians: List[VerifiedElectrician], filename: str):
         "scraped_at": datetime.now().isoformat(),
         "location": "Surat, Gujarat",
         "total_records": len(electricians),
-        "records": [asdict(e) for e in electricians]
+        "records": [e._asdict() for e in electricians]
     }
     
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    with open(filepath, 'wb') as f:
+        f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
     
     print(f"📁 Saved to: {filepath}")
     return filepath
@@ -412,7 +439,9 @@ def main():
     print("🎯 Extracting real data with verifiable source links")
     print("=" * 80)
     
-    all_electricians = []
+    # Records keyed by phone as they arrive; the first record per phone wins
+    unique_by_phone = {}
+    total_scraped = 0
     
     # Categories to scrape
     print("\n🌐 Scraping from multiple sources...")
@@ -425,39 +454,41 @@ def main():
         ("House-Wiring-Contractors", "House Wiring"),
     ]
     
-    for cat, svc in justdial_cats:
-        results = scrape_justdial_surat(cat, svc)
-        all_electricians.extend(results)
-        time.sleep(random.uniform(1, 2))
-    
     # Sulekha categories
     sulekha_cats = [
         ("electricians", "Electrician"),
         ("electrical-contractors", "Electrical Contractor"),
     ]
     
-    for cat, svc in sulekha_cats:
-        results = scrape_sulekha_surat(cat, svc)
-        all_electricians.extend(results)
-        time.sleep(random.uniform(1, 2))
-    
     # IndiaMART categories
     indiamart_cats = [
         ("electricians", "Electrician"),
         ("electrical-contractors", "Electrical Contractor"),
     ]
     
-    for cat, svc in indiamart_cats:
-        results = scrape_indiamart_surat(cat, svc)
-        all_electricians.extend(results)
-        time.sleep(random.uniform(1, 2))
+    # Scrape the three sites concurrently; each site's categories still run
+    # one at a time with a 2-4s delay before every request
+    sites = [
+        (scrape_justdial_surat, justdial_cats),
+        (scrape_sulekha_surat, sulekha_cats),
+        (scrape_indiamart_surat, indiamart_cats),
+    ]
+    with ThreadPoolExecutor(max_workers=len(sites)) as executor:
+        futures = [executor.submit(scrape_site, fn, cats) for fn, cats in sites]
+        # Collect in site order so output and deduplication match a serial run
+        for future in futures:
+            results, lines = future.result()
+            for line in lines:
+                print(line)
+            total_scraped += len(results)
+            for e in results:
+                unique_by_phone.setdefault(e.phone, e)
     
-    # Deduplicate
-    unique = deduplicate_by_phone(all_electricians)
+    unique = list(unique_by_phone.values())
     
     print(f"\n📊 SCRAPING SUMMARY")
     print("-" * 40)
-    print(f"Total scraped: {len(all_electricians)}")
+    print(f"Total scraped: {total_scraped}")
     print(f"After deduplication: {len(unique)}")
     
     if unique:
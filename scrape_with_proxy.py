@@ -9,16 +9,21 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent))
 
 import requests
-from bs4 import BeautifulSoup
-import re
+from requests.adapters import HTTPAdapter
 import time
 import random
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+from typing import Dict, List, Optional
 from dotenv import load_dotenv
 
 from src.models import Electrician
 from src.storage import DataStorage
 from src.proxy_manager import ProxyManager, ProxyProviderManager, Proxy
+from src.scrapers import RATING_NUM_RE, extract_phones
+from src.scrapers.html_utils import class_xpath, element_text, find_first, parse_page
 
 # Load environment variables
 load_dotenv()
@@ -113,36 +118,81 @@ def get_headers():
     }
 
 
+# One pooled session per proxy (None for direct requests), so repeat requests
+# through the same proxy reuse its keep-alive connections and cookies never
+# cross from one proxy identity to another
+_SESSIONS: Dict[Optional[str], requests.Session] = {}
+_SESSIONS_LOCK = threading.Lock()
+
+
+def get_session(proxy: Optional[Proxy]) -> requests.Session:
+    """Get the pooled session that routes through proxy, creating it on first use."""
+    key = proxy.url if proxy else None
+    with _SESSIONS_LOCK:
+        session = _SESSIONS.get(key)
+        if session is None:
+            session = requests.Session()
+            # Retries stay in make_request, which rotates proxies between attempts
+            adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32, max_retries=0)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _SESSIONS[key] = session
+    return session
+
+
+
+
 def extract_phone_numbers(text):
     """Extract Indian phone numbers from text."""
-    patterns = [
-        r'\+91[\s\-]?[6-9]\d{9}',
-        r'91[\s\-]?[6-9]\d{9}',
-        r'0[6-9]\d{9}',
-        r'[6-9]\d{9}',
-        r'[6-9]\d{4}[\s\-]?\d{5}',
-    ]
-    
-    phones = []
-    for pattern in patterns:
-        matches = re.findall(pattern, text)
-        phones.extend(matches)
-    
-    normalized = []
-    for phone in phones:
-        digits = "".join(filter(str.isdigit, phone))
-        if len(digits) >= 10:
-            normalized.append(digits[-10:])
-    
-    return list(set(normalized))
+    # Not fake like 9999999999 or 9898989898
+    return [phone for phone in extract_phones(text) if len(set(phone)) >= 4]
+
+
+JUSTDIAL_LISTING_XPATH = class_xpath(["div", "li", "section"], "cntanr|store|result|jsx|card")
+JUSTDIAL_NAME_XPATH = class_xpath(["h2", "h3", "span", "a"], "name|title|lng_cont|store")
+JUSTDIAL_ADDR_XPATH = class_xpath(["span", "p", "div"], "addr|location|area")
+JUSTDIAL_RATING_XPATH = class_xpath(["span"], "rating|green-box|star")
+
+SULEKHA_LISTING_XPATH = class_xpath(["div", "article", "section"], "vendor|card|listing|provider|result")
+SULEKHA_NAME_XPATH = class_xpath(["h2", "h3", "a", "span"], "name|title|vendor")
+
+
+# Pages are cut off after this many bytes. Listings come early in a page, and
+# oversized responses are usually captcha or error pages with large script blobs
+MAX_PAGE_BYTES = 2_000_000
+
+
+def read_capped(response, limit: int = MAX_PAGE_BYTES) -> bytes:
+    """
+    Read a streamed response's (decompressed) body, stopping once it passes
+    limit bytes, and return it.
+    """
+    chunks = []
+    size = 0
+    try:
+        for chunk in response.iter_content(chunk_size=64 * 1024):
+            chunks.append(chunk)
+            size += len(chunk)
+            if size > limit:
+                logger.warning(f"Page over {limit} bytes, truncated: {response.url}")
+                break
+    finally:
+        # Releases the connection, or drops it if the body was cut off
+        response.close()
+    
+    return b"".join(chunks)[:limit]
 
 
 def make_request(url: str, proxy_manager: ProxyManager, max_retries: int = 3):
-    """Make a request with proxy rotation and retry logic."""
+    """
+    Make a request with proxy rotation and retry logic.
+    Returns (response, body), or None if every attempt failed.
+    """
     
     for attempt in range(max_retries):
         proxy = proxy_manager.get_proxy() if proxy_manager.count > 0 else None
         proxies = proxy.dict if proxy else None
+        session = get_session(proxy)
         
         try:
             # Add delay between requests
@@ -152,24 +202,29 @@ def make_request(url: str, proxy_manager: ProxyManager, max_retries: int = 3):
             )
             time.sleep(delay)
             
-            response = requests.get(
+            # Proxies go per request so they take precedence over HTTP(S)_PROXY
+            response = session.get(
                 url,
                 headers=get_headers(),
                 proxies=proxies,
                 timeout=30,
+                stream=True,
             )
+            body = read_capped(response)
+            # Time to response headers, so page size does not count against the proxy
+            elapsed = response.elapsed.total_seconds()
             
-            # Check for blocks
-            if response.status_code == 403 or "captcha" in response.text.lower():
+            # Check for blocks, in the raw body rather than a decoded copy
+            if response.status_code == 403 or b"captcha" in body.lower():
                 logger.warning(f"Blocked on {url}, rotating proxy...")
                 if proxy:
-                    proxy_manager.mark_failure(proxy)
+                    proxy_manager.mark_failure(proxy, elapsed)
                 continue
             
             if response.status_code == 200:
                 if proxy:
-                    proxy_manager.mark_success(proxy)
-                return response
+                    proxy_manager.mark_success(proxy, elapsed)
+                return response, body
             
         except requests.exceptions.RequestException as e:
             logger.warning(f"Request failed: {e}")
@@ -179,46 +234,61 @@ def make_request(url: str, proxy_manager: ProxyManager, max_retries: int = 3):
     return None
 
 
+# Listing URLs per source, filled in with a city's slug
+JUSTDIAL_URL_TEMPLATES = (
+    "https://www.justdial.com/{slug}/electricians",
+    "https://www.justdial.com/{slug}/electrical-contractors",
+)
+SULEKHA_URL_TEMPLATE = "https://www.sulekha.com/electricians/{slug}"
+
+
+@lru_cache(maxsize=None)
+def city_urls(city: str) -> tuple:
+    """Build a city's (JustDial URLs, Sulekha URL) once per city."""
+    slug = city.lower().replace(" ", "-")
+    return (
+        tuple(template.format(slug=slug) for template in JUSTDIAL_URL_TEMPLATES),
+        SULEKHA_URL_TEMPLATE.format(slug=slug),
+    )
+
+
 def scrape_justdial(city: str, state: str, proxy_manager: ProxyManager):
     """Scrape JustDial with proxy support."""
     electricians = []
-    city_slug = city.lower().replace(" ", "-")
+    justdial_urls, _ = city_urls(city)
     
-    urls = [
-        f"https://www.justdial.com/{city_slug}/electricians",
-        f"https://www.justdial.com/{city_slug}/electrical-contractors",
-    ]
-    
-    for url in urls:
+    for url in justdial_urls:
         logger.info(f"Scraping: {url}")
-        response = make_request(url, proxy_manager)
+        fetched = make_request(url, proxy_manager)
         
-        if not response:
+        if not fetched:
             logger.warning(f"Failed to fetch {url}")
             continue
         
-        soup = BeautifulSoup(response.text, "lxml")
+        tree = parse_page(*fetched)
+        if tree is None:
+            continue
         
         # Find all potential listing containers
-        for div in soup.find_all(["div", "li", "section"], class_=re.compile(r"cntanr|store|result|jsx|card")):
-            text = div.get_text()
+        for div in JUSTDIAL_LISTING_XPATH(tree):
+            text = element_text(div)
             phones = extract_phone_numbers(text)
             
             if phones:
                 # Try to find name
-                name_elem = div.find(["h2", "h3", "span", "a"], class_=re.compile(r"name|title|lng_cont|store"))
-                name = name_elem.get_text(strip=True)[:100] if name_elem else "Electrician"
+                name_elem = find_first(JUSTDIAL_NAME_XPATH, div)
+                name = element_text(name_elem, strip=True)[:100] if name_elem is not None else "Electrician"
                 
                 # Try to find address
-                addr_elem = div.find(["span", "p", "div"], class_=re.compile(r"addr|location|area"))
-                address = addr_elem.get_text(strip=True)[:200] if addr_elem else None
+                addr_elem = find_first(JUSTDIAL_ADDR_XPATH, div)
+                address = element_text(addr_elem, strip=True)[:200] if addr_elem is not None else None
                 
                 # Try to find rating
                 rating = None
-                rating_elem = div.find(["span"], class_=re.compile(r"rating|green-box|star"))
-                if rating_elem:
+                rating_elem = find_first(JUSTDIAL_RATING_XPATH, div)
+                if rating_elem is not None:
                     try:
-                        rating = float(re.search(r'(\d+\.?\d*)', rating_elem.get_text()).group(1))
+                        rating = float(RATING_NUM_RE.search(element_text(rating_elem)).group(1))
                     except:
                         pass
                 
@@ -240,26 +310,26 @@ def scrape_justdial(city: str, state: str, proxy_manager: ProxyManager):
 def scrape_sulekha(city: str, state: str, proxy_manager: ProxyManager):
     """Scrape Sulekha with proxy support."""
     electricians = []
-    city_slug = city.lower().replace(" ", "-")
-    
-    url = f"https://www.sulekha.com/electricians/{city_slug}"
+    _, url = city_urls(city)
     logger.info(f"Scraping: {url}")
     
-    response = make_request(url, proxy_manager)
+    fetched = make_request(url, proxy_manager)
     
-    if not response:
+    if not fetched:
         logger.warning(f"Failed to fetch {url}")
         return electricians
     
-    soup = BeautifulSoup(response.text, "lxml")
+    tree = parse_page(*fetched)
+    if tree is None:
+        return electricians
     
-    for div in soup.find_all(["div", "article", "section"], class_=re.compile(r"vendor|card|listing|provider|result")):
-        text = div.get_text()
+    for div in SULEKHA_LISTING_XPATH(tree):
+        text = element_text(div)
         phones = extract_phone_numbers(text)
         
         if phones:
-            name_elem = div.find(["h2", "h3", "a", "span"], class_=re.compile(r"name|title|vendor"))
-            name = name_elem.get_text(strip=True)[:100] if name_elem else "Electrician"
+            name_elem = find_first(SULEKHA_NAME_XPATH, div)
+            name = element_text(name_elem, strip=True)[:100] if name_elem is not None else "Electrician"
             
             for phone in phones[:1]:
                 electricians.append(Electrician(
@@ -274,8 +344,8 @@ def scrape_sulekha(city: str, state: str, proxy_manager: ProxyManager):
     return electricians
 
 
-def scrape_city(city: str, state: str, proxy_manager: ProxyManager):
-    """Scrape all sources for a city."""
+def scrape_city(city: str, state: str, proxy_manager: ProxyManager) -> List[Electrician]:
+    """Scrape all sources for a city. Returns its deduplicated electricians."""
     all_electricians = []
     
     logger.info(f"\n{'='*50}")
@@ -298,14 +368,15 @@ def scrape_city(city: str, state: str, proxy_manager: ProxyManager):
     except Exception as e:
         logger.error(f"Sulekha error: {e}")
     
-    # Deduplicate and save
-    if all_electricians:
-        unique = list({e.get_unique_key(): e for e in all_electricians}.values())
-        saved = storage.save_to_database(unique)
-        logger.info(f"✅ Saved {saved} new records for {city}")
-        return saved
-    
-    return 0
+    # Deduplicate; main saves the records in batches of cities
+    unique = list({e.get_unique_key(): e for e in all_electricians}.values())
+    if unique:
+        logger.info(f"✅ Found {len(unique)} unique records for {city}")
+    return unique
+
+
+# Cities saved per transaction; a crash or block midway loses at most this many
+SAVE_EVERY_CITIES = 5
 
 
 def main():
@@ -354,17 +425,54 @@ def main():
         ("Nagpur", "Maharashtra"),
     ]
     
+    pending = []  # records of finished cities not saved yet
+    pending_cities = 0
     total_saved = 0
     
-    for city, state in cities:
+    # Unique keys include the city, so records from different cities never collide
+    def flush():
+        nonlocal pending_cities, total_saved
+        if pending:
+            total_saved += storage.save_to_database(pending)
+            pending.clear()
+        pending_cities = 0
+    
+    # Cities are independent and mostly wait on delays and the network, so
+    # crawl several at once, one worker per proxy. Without proxies every
+    # request comes from this machine's IP, so cities run one at a time
+    executor = ThreadPoolExecutor(max_workers=min(len(cities), proxy_manager.count) or 1)
+    futures = {
+        executor.submit(scrape_city, city, state, proxy_manager): city
+        for city, state in cities
+    }
+    remaining = set(futures)
+    
+    def collect(future):
+        nonlocal pending_cities
         try:
-            saved = scrape_city(city, state, proxy_manager)
-            total_saved += saved
-        except KeyboardInterrupt:
-            print("\n\n⚠️  Scraping interrupted by user")
-            break
+            pending.extend(future.result())
         except Exception as e:
-            logger.error(f"Error scraping {city}: {e}")
+            logger.error(f"Error scraping {futures[future]}: {e}")
+        remaining.discard(future)
+        pending_cities += 1
+        if pending_cities >= SAVE_EVERY_CITIES:
+            flush()
+    
+    try:
+        for future in as_completed(futures):
+            collect(future)
+    except KeyboardInterrupt:
+        print("\n\n⚠️  Scraping interrupted by user")
+        # Cities not yet started are dropped; ones in progress finish and
+        # are still saved
+        executor.shutdown(cancel_futures=True)
+        for future in list(remaining):
+            if not future.cancelled():
+                collect(future)
+    finally:
+        executor.shutdown()
+    
+    flush()
     
     # Final stats
     print("\n" + "="*60)
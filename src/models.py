@@ -1,11 +1,23 @@
 """
 Data models for storing scraped electrician information.
 """
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field
+from functools import lru_cache
 from typing import Optional, List
 from datetime import datetime
 
 
+@lru_cache(maxsize=1 << 16)
+def make_unique_key(phone: str, city: str, state: str) -> str:
+    """
+    Generate the deduplication key for an electrician record.
+    Cached, since a record's key is needed for hashing, deduplication and saving.
+    """
+    # Use phone number as primary key, normalize it
+    phone_normalized = "".join(filter(str.isdigit, phone))[-10:]
+    return f"{phone_normalized}_{city.lower()}_{state.lower()}"
+
+
 @dataclass
 class Electrician:
     """Data model for an electrician/lineman."""
@@ -43,7 +55,11 @@ class Electrician:
     
     def to_dict(self) -> dict:
         """Convert to dictionary."""
-        return asdict(self)
+        # Fields are scalars apart from services, so a shallow copy replaces
+        # asdict's recursive deep copy
+        data = {name: getattr(self, name) for name in self.__dataclass_fields__}
+        data["services"] = list(self.services or [])
+        return data
     
     @classmethod
     def from_dict(cls, data: dict) -> "Electrician":
@@ -52,9 +68,7 @@ class Electrician:
     
     def get_unique_key(self) -> str:
         """Generate a unique key for deduplication."""
-        # Use phone number as primary key, normalize it
-        phone_normalized = "".join(filter(str.isdigit, self.phone))[-10:]
-        return f"{phone_normalized}_{self.city.lower()}_{self.state.lower()}"
+        return make_unique_key(self.phone, self.city, self.state)
     
     def __hash__(self):
         return hash(self.get_unique_key())
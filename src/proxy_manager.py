@@ -5,10 +5,14 @@ Supports multiple proxy providers and rotation strategies.
 import os
 import random
 import time
+import threading
 import requests
+from requests.adapters import HTTPAdapter
 from typing import List, Optional, Dict
 from dataclasses import dataclass
 from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
 import logging
 
 logger = logging.getLogger(__name__)
@@ -26,17 +30,18 @@ class Proxy:
     last_used: float = 0
     fail_count: int = 0
     success_count: int = 0
+    latency_ewma: float = 0.5  # Smoothed response time in seconds
     
-    @property
+    @cached_property
     def url(self) -> str:
-        """Get proxy URL."""
+        """Get proxy URL, built once per proxy."""
         if self.username and self.password:
             return f"{self.protocol}://{self.username}:{self.password}@{self.host}:{self.port}"
         return f"{self.protocol}://{self.host}:{self.port}"
     
-    @property
+    @cached_property
     def dict(self) -> Dict[str, str]:
-        """Get proxy dict for requests."""
+        """Get proxy dict for requests, built once per proxy."""
         return {
             "http": self.url,
             "https": self.url,
@@ -47,6 +52,15 @@ class Proxy:
         """Calculate success rate."""
         total = self.success_count + self.fail_count
         return self.success_count / total if total > 0 else 0.5
+    
+    @property
+    def score(self) -> float:
+        """Selection weight: success rate, discounted by smoothed response time."""
+        return (self.success_rate + 0.1) / (self.latency_ewma + 0.05)
+    
+    def record_latency(self, elapsed: float):
+        """Fold a response time in seconds into latency_ewma."""
+        self.latency_ewma = 0.8 * self.latency_ewma + 0.2 * elapsed
 
 
 class ProxyManager:
@@ -66,6 +80,14 @@ class ProxyManager:
         self.min_delay_between_uses = min_delay_between_uses
         self.max_failures = max_failures
         self._current_index = 0
+        # Scrapers share one manager across threads
+        self._lock = threading.Lock()
+        
+        # Pooled session so repeat probes reuse keep-alive connections
+        self._test_session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=32, pool_maxsize=128)
+        self._test_session.mount("http://", adapter)
+        self._test_session.mount("https://", adapter)
     
     def add_proxy(self, proxy: Proxy):
         """Add a proxy to the pool."""
@@ -124,45 +146,62 @@ class ProxyManager:
     
     def get_proxy(self) -> Optional[Proxy]:
         """Get the next proxy based on rotation strategy."""
-        if not self.proxies:
-            return None
-        
-        # Remove failed proxies
-        self.proxies = deque([p for p in self.proxies if p.fail_count < self.max_failures])
-        
-        if not self.proxies:
-            logger.error("All proxies have failed!")
-            return None
-        
-        if self.rotation_strategy == "round_robin":
-            proxy = self.proxies[0]
-            self.proxies.rotate(-1)
-        elif self.rotation_strategy == "random":
-            proxy = random.choice(list(self.proxies))
-        elif self.rotation_strategy == "weighted":
-            # Prefer proxies with higher success rates
-            weights = [p.success_rate + 0.1 for p in self.proxies]
-            proxy = random.choices(list(self.proxies), weights=weights)[0]
-        else:
-            proxy = self.proxies[0]
-        
-        # Ensure minimum delay between uses
-        time_since_last = time.time() - proxy.last_used
-        if time_since_last < self.min_delay_between_uses:
-            time.sleep(self.min_delay_between_uses - time_since_last)
+        with self._lock:
+            # Failed proxies are evicted by mark_failure, so the pool needs no filtering here
+            if not self.proxies:
+                return None
+            
+            now = time.monotonic()
+            
+            if self.rotation_strategy == "round_robin":
+                # The head of the rotation is the proxy used longest ago
+                proxy = self.proxies[0]
+                self.proxies.rotate(-1)
+            elif self.rotation_strategy in ("random", "weighted"):
+                # Pick among ready proxies, else wait for the one ready soonest
+                ready_since = now - self.min_delay_between_uses
+                candidates = [p for p in self.proxies if p.last_used <= ready_since]
+                if not candidates:
+                    candidates = [min(self.proxies, key=lambda p: p.last_used)]
+                
+                if self.rotation_strategy == "random":
+                    proxy = random.choice(candidates)
+                else:
+                    # Prefer proxies that succeed more and respond faster
+                    weights = [p.score for p in candidates]
+                    proxy = random.choices(candidates, weights=weights)[0]
+            else:
+                proxy = self.proxies[0]
+            
+            # Reserve the next slot under the lock, but sleep outside it
+            wait = self.min_delay_between_uses - (now - proxy.last_used)
+            proxy.last_used = now + max(wait, 0)
         
-        proxy.last_used = time.time()
+        if wait > 0:
+            time.sleep(wait)
         return proxy
     
-    def mark_success(self, proxy: Proxy):
-        """Mark a proxy request as successful."""
-        proxy.success_count += 1
-        proxy.fail_count = max(0, proxy.fail_count - 1)  # Reduce fail count on success
+    def mark_success(self, proxy: Proxy, elapsed: Optional[float] = None):
+        """Mark a proxy request as successful, with its response time if known."""
+        with self._lock:
+            if elapsed is not None:
+                proxy.record_latency(elapsed)
+            proxy.success_count += 1
+            proxy.fail_count = max(0, proxy.fail_count - 1)  # Reduce fail count on success
     
-    def mark_failure(self, proxy: Proxy):
-        """Mark a proxy request as failed."""
-        proxy.fail_count += 1
+    def mark_failure(self, proxy: Proxy, elapsed: Optional[float] = None):
+        """Mark a proxy request as failed, with its response time if known."""
+        with self._lock:
+            if elapsed is not None:
+                proxy.record_latency(elapsed)
+            proxy.fail_count += 1
+            # An in-flight request can fail a proxy that was already evicted
+            evicted = proxy.fail_count >= self.max_failures and proxy in self.proxies
+            if evicted:
+                self.proxies.remove(proxy)
         logger.warning(f"Proxy {proxy.host}:{proxy.port} failed ({proxy.fail_count}/{self.max_failures})")
+        if evicted and not self.proxies:
+            logger.error("All proxies have failed!")
     
     def test_proxy(self, proxy: Proxy, timeout: int = 10) -> bool:
         """Test if a proxy is working."""
@@ -173,10 +212,11 @@ class ProxyManager:
         
         for url in test_urls:
             try:
-                response = requests.get(
+                # Dead proxies usually fail to connect, so give up on those fast
+                response = self._test_session.get(
                     url,
                     proxies=proxy.dict,
-                    timeout=timeout,
+                    timeout=(3, timeout),
                 )
                 if response.status_code == 200:
                     logger.info(f"Proxy {proxy.host}:{proxy.port} is working")
@@ -189,17 +229,20 @@ class ProxyManager:
     
     def test_all_proxies(self) -> Dict[str, int]:
         """Test all proxies and return stats."""
-        working = 0
-        failed = 0
+        proxies = list(self.proxies)
+        if not proxies:
+            return {"working": 0, "failed": 0}
         
-        for proxy in list(self.proxies):
-            if self.test_proxy(proxy):
-                working += 1
-            else:
-                failed += 1
-                self.proxies.remove(proxy)
+        # Probes are network-bound, so run them concurrently
+        with ThreadPoolExecutor(max_workers=min(64, len(proxies))) as executor:
+            results = list(executor.map(self.test_proxy, proxies))
+        
+        failed = {id(proxy) for proxy, ok in zip(proxies, results) if not ok}
+        if failed:
+            with self._lock:
+                self.proxies = deque(p for p in self.proxies if id(p) not in failed)
         
-        return {"working": working, "failed": failed}
+        return {"working": len(proxies) - len(failed), "failed": len(failed)}
     
     @property
     def count(self) -> int:
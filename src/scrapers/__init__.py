@@ -2,9 +2,12 @@
 Base scraper class with common functionality.
 """
 import random
+import re
 import time
 import logging
+import threading
 from abc import ABC, abstractmethod
+from contextlib import contextmanager
 from typing import List, Optional, Dict, Any
 import requests
 from requests.adapters import HTTPAdapter
@@ -21,6 +24,144 @@ from src.config import (
 )
 from src.models import Electrician, ScrapeResult
 
+# Indian phone numbers in one pass: the optional +91/91/0 prefix is consumed
+# so its digits never start a match of their own; group 1 is the number.
+# The leading lookahead names every possible first character, which lets the
+# engine skip straight to candidates instead of trying each position, and a
+# 91 prefix can't start inside a longer digit run
+PHONE_RE = re.compile(r'(?=[+06-9])(?:(?<!\d)\+?91[\s\-]?)?0?([6-9]\d{4}[\s\-]?\d{5}|[6-9]\d{9})')
+# Raw-bytes pre-check. Every PHONE_RE number has [6-9]\d{4} before its
+# optional separator, so a page without that run can't hold a phone
+# unless markup splits those first five digits
+PHONE_HINT_RE = re.compile(rb'[6-9]\d{4}')
+# First number in a rating badge, e.g. "4.3" in "4.3 (120 ratings)"
+RATING_NUM_RE = re.compile(r'(\d+\.?\d*)')
+
+
+def normalize_phone(match: str) -> str:
+    """Digits of a PHONE_RE number, dropping the one separator it allows."""
+    # A captured number is 10 digits, or 11 characters with the separator
+    # at index 5, so slicing it out normalizes without a scan
+    return match if len(match) == 10 else match[:5] + match[6:]
+
+
+def extract_phones(text: str) -> List[str]:
+    """Extract Indian phone numbers from text, without duplicates, in page order."""
+    phones = []
+    for match in PHONE_RE.finditer(text):
+        phones.append(normalize_phone(match.group(1)))
+        # A bare "91" may be a prefix or a number's first digits, e.g. text
+        # nodes "9176543210" + "45"; keep both readings, prefixed one first
+        if match.start(1) - match.start() == 2:
+            unprefixed = text[match.start():match.start() + 10]
+            if unprefixed.isdigit():
+                phones.append(unprefixed)
+    # dict.fromkeys dedupes in page order, so the first phone is stable
+    return list(dict.fromkeys(phones))
+
+
+def has_phone_hint(content: bytes) -> bool:
+    """Whether a raw page could hold a phone number; blocked or empty pages can't."""
+    return PHONE_HINT_RE.search(content) is not None
+
+
+def create_session(
+    headers: Optional[Dict[str, str]] = None,
+    retries: int = 3,
+    backoff_factor: float = 1,
+    status_forcelist=(429, 500, 502, 503, 504),
+    allowed_methods=Retry.DEFAULT_ALLOWED_METHODS,
+    raise_on_status: bool = True,
+    pool_connections: int = 10,
+    pool_maxsize: int = 10,
+) -> requests.Session:
+    """Create a pooled requests session that retries status_forcelist responses with backoff."""
+    session = requests.Session()
+    retry_strategy = Retry(
+        total=retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=list(status_forcelist),
+        allowed_methods=allowed_methods,
+        raise_on_status=raise_on_status,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        max_retries=retry_strategy,
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    if headers:
+        session.headers.update(headers)
+    return session
+
+
+def _load_user_agent_pool() -> tuple:
+    """
+    Load fake_useragent's user agents once, keeping the browsers and operating
+    systems its .random picks from; fall back to the predefined list.
+    """
+    try:
+        ua = UserAgent()
+        pool = tuple(
+            b["useragent"] for b in ua.data_browsers
+            if b.get("browser") in ua.browsers and b.get("os") in ua.os
+        )
+    except Exception:
+        pool = ()
+    return pool or tuple(USER_AGENTS)
+
+
+# Shared by every scraper, so picking a user agent is a plain random.choice
+USER_AGENT_POOL = _load_user_agent_pool()
+
+# Fixed request headers, installed once on each scraper's session
+BASE_HEADERS = {
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9,hi;q=0.8",
+    "Accept-Encoding": "gzip, deflate, br",
+    "Connection": "keep-alive",
+    "Upgrade-Insecure-Requests": "1",
+    "Cache-Control": "max-age=0",
+}
+
+
+class _SiteThrottle:
+    """Spaces out requests to one site across every scraper instance and thread."""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._last_request = None
+    
+    @contextmanager
+    def slot(self, delay: float):
+        """
+        Hold the site's only request slot, first waiting until delay seconds
+        have passed since its previous request finished.
+        """
+        with self._lock:
+            if self._last_request is not None:
+                remaining = self._last_request + delay - time.monotonic()
+                if remaining > 0:
+                    time.sleep(remaining)
+            try:
+                yield
+            finally:
+                self._last_request = time.monotonic()
+
+
+_SITE_THROTTLES: Dict[str, _SiteThrottle] = {}
+_SITE_THROTTLES_LOCK = threading.Lock()
+
+
+def _get_site_throttle(name: str) -> _SiteThrottle:
+    """Return the throttle shared by every scraper for site name."""
+    with _SITE_THROTTLES_LOCK:
+        throttle = _SITE_THROTTLES.get(name)
+        if throttle is None:
+            throttle = _SITE_THROTTLES[name] = _SiteThrottle()
+        return throttle
+
 
 class BaseScraper(ABC):
     """Base class for all scrapers with common functionality."""
@@ -30,13 +171,8 @@ class BaseScraper(ABC):
         self.logger = self._setup_logger()
         self.session = self._create_session()
         self._request_count = 0
-        
-        # Try to use fake_useragent, fallback to predefined list
-        try:
-            self.ua = UserAgent()
-            self._use_fake_ua = True
-        except Exception:
-            self._use_fake_ua = False
+        # Shared per site, so per-thread instances still take turns
+        self._throttle = _get_site_throttle(name)
     
     def _setup_logger(self) -> logging.Logger:
         """Set up logger for the scraper."""
@@ -53,19 +189,12 @@ class BaseScraper(ABC):
     
     def _create_session(self) -> requests.Session:
         """Create a requests session with retry logic."""
-        session = requests.Session()
-        
-        retry_strategy = Retry(
-            total=MAX_RETRIES,
-            backoff_factor=1,
-            status_forcelist=[429, 500, 502, 503, 504],
-            allowed_methods=["HEAD", "GET", "OPTIONS", "POST"]
+        session = create_session(
+            BASE_HEADERS,
+            retries=MAX_RETRIES,
+            allowed_methods=["HEAD", "GET", "OPTIONS", "POST"],
         )
         
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        session.mount("http://", adapter)
-        session.mount("https://", adapter)
-        
         # Set up proxy if configured
         if PROXY_CONFIG.get("host") and PROXY_CONFIG.get("port"):
             proxy_url = self._build_proxy_url()
@@ -89,24 +218,14 @@ class BaseScraper(ABC):
     
     def _get_random_user_agent(self) -> str:
         """Get a random user agent string."""
-        if self._use_fake_ua:
-            try:
-                return self.ua.random
-            except Exception:
-                pass
-        return random.choice(USER_AGENTS)
+        return random.choice(USER_AGENT_POOL)
     
     def _get_headers(self, extra_headers: Optional[Dict[str, str]] = None) -> Dict[str, str]:
-        """Get request headers with random user agent."""
-        headers = {
-            "User-Agent": self._get_random_user_agent(),
-            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8",
-            "Accept-Language": "en-US,en;q=0.9,hi;q=0.8",
-            "Accept-Encoding": "gzip, deflate, br",
-            "Connection": "keep-alive",
-            "Upgrade-Insecure-Requests": "1",
-            "Cache-Control": "max-age=0",
-        }
+        """
+        Get per-request headers: a random user agent plus any extras.
+        The session merges them over BASE_HEADERS.
+        """
+        headers = {"User-Agent": self._get_random_user_agent()}
         if extra_headers:
             headers.update(extra_headers)
         return headers
@@ -132,32 +251,32 @@ class BaseScraper(ABC):
         """Make an HTTP request with retry logic."""
         self._request_count += 1
         
-        # Add delay between requests
-        if self._request_count > 1:
-            self._random_delay()
-        
         request_headers = self._get_headers(headers)
         
         self.logger.debug(f"Making {method} request to {url}")
         
+        # Add delay between requests to this site, whichever thread sent the last one
+        delay = random.uniform(REQUEST_DELAY_MIN, REQUEST_DELAY_MAX)
+        
         try:
-            if method.upper() == "GET":
-                response = self.session.get(
-                    url,
-                    params=params,
-                    headers=request_headers,
-                    timeout=timeout,
-                )
-            elif method.upper() == "POST":
-                response = self.session.post(
-                    url,
-                    params=params,
-                    data=data,
-                    headers=request_headers,
-                    timeout=timeout,
-                )
-            else:
-                raise ValueError(f"Unsupported HTTP method: {method}")
+            with self._throttle.slot(delay):
+                if method.upper() == "GET":
+                    response = self.session.get(
+                        url,
+                        params=params,
+                        headers=request_headers,
+                        timeout=timeout,
+                    )
+                elif method.upper() == "POST":
+                    response = self.session.post(
+                        url,
+                        params=params,
+                        data=data,
+                        headers=request_headers,
+                        timeout=timeout,
+                    )
+                else:
+                    raise ValueError(f"Unsupported HTTP method: {method}")
             
             response.raise_for_status()
             return response
@@ -168,32 +287,7 @@ class BaseScraper(ABC):
     
     def _extract_phone_numbers(self, text: str) -> List[str]:
         """Extract Indian phone numbers from text."""
-        import re
-        
-        # Patterns for Indian phone numbers
-        patterns = [
-            r'\+91[\s\-]?[6-9]\d{9}',  # +91 format
-            r'91[\s\-]?[6-9]\d{9}',     # 91 format
-            r'0[6-9]\d{9}',              # 0 prefix
-            r'[6-9]\d{9}',               # Plain 10 digit
-            r'[6-9]\d{4}[\s\-]?\d{5}',   # With space/dash in middle
-        ]
-        
-        phones = []
-        for pattern in patterns:
-            matches = re.findall(pattern, text)
-            phones.extend(matches)
-        
-        # Normalize phone numbers
-        normalized = []
-        for phone in phones:
-            # Remove all non-digit characters
-            digits = "".join(filter(str.isdigit, phone))
-            # Get last 10 digits
-            if len(digits) >= 10:
-                normalized.append(digits[-10:])
-        
-        return list(set(normalized))
+        return extract_phones(text)
     
     def _clean_text(self, text: str) -> str:
         """Clean and normalize text."""
@@ -0,0 +1,53 @@
+"""
+lxml helpers shared by the standalone scraping scripts.
+"""
+from typing import Optional
+
+from lxml import etree, html
+
+# bs4-style class_ regexes as compiled XPath: EXSLT re:test searches the class
+# attribute the same way, but the tree walk runs in libxml2
+XPATH_NAMESPACES = {"re": "http://exslt.org/regular-expressions"}
+
+# Text nodes as bs4's get_text sees them (script/style/template contents are not text)
+TEXT_NODES_XPATH = etree.XPath(".//text()[not(ancestor::script or ancestor::style or ancestor::template)]")
+
+
+def class_xpath(tags, class_pattern=None) -> etree.XPath:
+    """Compile an XPath for descendants with one of tags whose class matches class_pattern."""
+    expr = ".//*[%s]" % " or ".join(f"self::{tag}" for tag in tags)
+    if class_pattern:
+        expr += f"[re:test(@class, '{class_pattern}')]"
+    return etree.XPath(expr, namespaces=XPATH_NAMESPACES)
+
+
+def parse_page(response, content: Optional[bytes] = None):
+    """
+    Parse a page from its raw bytes, letting libxml2 decode them (honouring
+    any <meta charset>); a charset in the Content-Type header takes precedence.
+    content overrides response.content, e.g. for an already-read streamed body.
+    Returns None for an empty page.
+    """
+    parser = None
+    if 'charset=' in response.headers.get('Content-Type', '').lower():
+        parser = html.HTMLParser(encoding=response.encoding)
+    try:
+        if content is None:
+            content = response.content
+        return html.document_fromstring(content, parser=parser)
+    except etree.ParserError:
+        return None
+
+
+def find_first(xpath: etree.XPath, elem):
+    """Return the first element xpath finds under elem, or None."""
+    found = xpath(elem)
+    return found[0] if found else None
+
+
+def element_text(elem, separator: str = '', strip: bool = False) -> str:
+    """Text of elem like bs4's get_text(separator, strip=strip)."""
+    texts = TEXT_NODES_XPATH(elem)
+    if strip:
+        return separator.join(t for t in (s.strip() for s in texts) if t)
+    return separator.join(texts)
@@ -7,16 +7,30 @@ import json
 import os
 from datetime import datetime
 from pathlib import Path
-from typing import List, Optional, Dict, Any
-from sqlalchemy import create_engine, Column, Integer, String, Float, Boolean, Text, DateTime
+from typing import List, Optional, Dict, Any, Tuple
+import orjson
+from sqlalchemy import create_engine, event, func, delete, insert, Column, Index, Integer, String, Float, Boolean, Text, DateTime
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.schema import CreateIndex
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
-from src.models import Electrician, ScrapeResult
+from src.models import Electrician, ScrapeResult, make_unique_key
 from src.config import OUTPUT_DIR, DATABASE_URL
 
 Base = declarative_base()
 
+# SQLite tuning for short-lived import scripts (DataStorage(bulk_load=True));
+# a crash mid-import is fixed by rerunning. None of these settings are stored
+# in the database file, so they end with the connection
+SQLITE_BULK_PRAGMAS = {
+    "journal_mode": "MEMORY",
+    "synchronous": "OFF",
+    "temp_store": "MEMORY",
+    "mmap_size": 268435456,  # 256 MB
+    "cache_size": -65536,  # 64 MB
+}
+
 
 class ElectricianDB(Base):
     """SQLAlchemy model for electrician records."""
@@ -46,7 +60,7 @@ class ElectricianDB(Base):
     # New fields for categorization
     category = Column(String(100), index=True)  # Electrician, Meter Installer, Lineman, etc.
     service_description = Column(Text)  # Detailed description of services
-    smart_meter_score = Column(Integer, default=0)  # 0-100 score for smart meter installation fit
+    smart_meter_score = Column(Integer, default=0, index=True)  # 0-100 score for smart meter installation fit
     smart_meter_notes = Column(Text)  # Notes on why they are/aren't a good fit
     verified_by = Column(String(100))  # Who verified this record
     verified_at = Column(DateTime)  # When was it verified
@@ -98,19 +112,47 @@ class ElectricianDB(Base):
         )
 
 
+# Expression index for case-insensitive exact city lookups, e.g. the
+# func.lower(city) == "surat" counts in the Surat and verified-DB scripts
+Index("ix_electricians_city_lower", func.lower(ElectricianDB.city))
+
+
 class DataStorage:
     """Class for storing scraped data in various formats."""
     
-    def __init__(self, output_dir: Path = None, database_url: str = None):
+    def __init__(self, output_dir: Path = None, database_url: str = None, bulk_load: bool = False):
         self.output_dir = output_dir or OUTPUT_DIR
         self.output_dir.mkdir(parents=True, exist_ok=True)
         
         # Set up SQLite database
         self.database_url = database_url or DATABASE_URL
-        self.engine = create_engine(self.database_url)
+        self.bulk_load = bulk_load
+        connect_args = {}
+        if bulk_load and self.database_url.startswith("postgres"):
+            connect_args["options"] = "-c synchronous_commit=off"
+        self.engine = create_engine(self.database_url, connect_args=connect_args)
+        if bulk_load and self.engine.dialect.name == "sqlite":
+            event.listen(self.engine, "connect", self._set_sqlite_pragmas)
         Base.metadata.create_all(self.engine)
         self.Session = sessionmaker(bind=self.engine)
     
+    def create_missing_indexes(self):
+        """
+        Create indexes added to the model after the table already existed.
+        create_all() only indexes new tables, so scripts that write to an
+        existing database call this once as a migration step.
+        """
+        with self.engine.begin() as conn:
+            for index in ElectricianDB.__table__.indexes:
+                conn.execute(CreateIndex(index, if_not_exists=True))
+    
+    def _set_sqlite_pragmas(self, dbapi_connection, connection_record):
+        """Apply bulk-load PRAGMAs to each new SQLite connection."""
+        cursor = dbapi_connection.cursor()
+        for name, value in SQLITE_BULK_PRAGMAS.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+    
     def save_to_csv(
         self,
         electricians: List[Electrician],
@@ -164,20 +206,19 @@ class DataStorage:
         
         existing_data = []
         if append and filepath.exists():
-            with open(filepath, "r", encoding="utf-8") as f:
+            with open(filepath, "rb") as f:
                 try:
-                    existing_data = json.load(f)
-                except json.JSONDecodeError:
+                    existing_data = orjson.loads(f.read())
+                except orjson.JSONDecodeError:
                     existing_data = []
         
-        new_data = [e.to_dict() for e in electricians]
-        
-        # Deduplicate
-        all_data = existing_data + new_data
-        unique_data = list({d["phone"]: d for d in all_data}.values())
+        # Deduplicate by phone, newest record winning. orjson serializes the
+        # Electrician dataclasses directly, so no per-record dicts are built
+        unique_data = {d["phone"]: d for d in existing_data}
+        unique_data.update((e.phone, e) for e in electricians)
         
-        with open(filepath, "w", encoding="utf-8") as f:
-            json.dump(unique_data, f, indent=2, ensure_ascii=False)
+        with open(filepath, "wb") as f:
+            f.write(orjson.dumps(list(unique_data.values()), option=orjson.OPT_INDENT_2))
         
         return str(filepath)
     
@@ -188,29 +229,9 @@ class DataStorage:
     ) -> int:
         """Save electricians to SQLite database with deduplication."""
         session = self.Session()
-        saved_count = 0
         
         try:
-            for electrician in electricians:
-                unique_key = electrician.get_unique_key()
-                
-                # Check if record exists
-                existing = session.query(ElectricianDB).filter_by(unique_key=unique_key).first()
-                
-                if existing:
-                    if update_existing:
-                        # Update existing record with new data
-                        db_record = ElectricianDB.from_electrician(electrician)
-                        for key in ["name", "address", "rating", "review_count", "source_url"]:
-                            if getattr(db_record, key):
-                                setattr(existing, key, getattr(db_record, key))
-                        existing.scraped_at = datetime.utcnow()
-                else:
-                    # Insert new record
-                    db_record = ElectricianDB.from_electrician(electrician)
-                    session.add(db_record)
-                    saved_count += 1
-            
+            saved_count = self._save_records(session, electricians, update_existing)
             session.commit()
             
         except Exception as e:
@@ -221,6 +242,103 @@ class DataStorage:
         
         return saved_count
     
+    def replace_city_records(
+        self,
+        city: str,
+        rows: List[Dict[str, Any]],
+    ) -> Tuple[int, int]:
+        """
+        Replace all records for a city with plain dict rows in a single transaction.
+        Returns (deleted_count, saved_count).
+        """
+        with self.engine.begin() as conn:
+            deleted = conn.execute(
+                delete(ElectricianDB).where(func.lower(ElectricianDB.city) == city.lower())
+            ).rowcount
+            saved_count = self._insert_rows(conn, rows)
+        
+        return deleted, saved_count
+    
+    def bulk_insert_dicts(self, rows: List[Dict[str, Any]]) -> int:
+        """
+        Insert plain dict rows with one executemany, bypassing the ORM.
+        Rows whose unique_key already exists are skipped. Returns rows inserted.
+        """
+        with self.engine.begin() as conn:
+            return self._insert_rows(conn, rows)
+    
+    def _insert_rows(self, conn, rows: List[Dict[str, Any]]) -> int:
+        """Normalize dict rows to full table rows and insert them, ignoring duplicates."""
+        if not rows:
+            return 0
+        
+        table = ElectricianDB.__table__
+        now = datetime.utcnow()
+        values = []
+        for row in rows:
+            value = {}
+            for column in table.columns:
+                if column.primary_key:
+                    continue
+                v = row.get(column.name)
+                if v is None and column.default is not None and column.default.is_scalar:
+                    v = column.default.arg
+                value[column.name] = v
+            if isinstance(value["services"], list):
+                value["services"] = json.dumps(value["services"]) if value["services"] else None
+            if not value["unique_key"]:
+                value["unique_key"] = make_unique_key(value["phone"], value["city"], value["state"])
+            if value["scraped_at"] is None:
+                value["scraped_at"] = now
+            values.append(value)
+        
+        dialect = conn.dialect.name
+        if dialect == "sqlite":
+            stmt = sqlite.insert(table).on_conflict_do_nothing(index_elements=["unique_key"])
+        elif dialect == "postgresql":
+            stmt = postgresql.insert(table).on_conflict_do_nothing(index_elements=["unique_key"])
+        else:
+            stmt = insert(table)
+        
+        return conn.execute(stmt, values).rowcount
+    
+    def _save_records(
+        self,
+        session,
+        electricians: List[Electrician],
+        update_existing: bool,
+    ) -> int:
+        """Insert/update electricians within an open session without committing."""
+        unique_keys = [e.get_unique_key() for e in electricians]
+        
+        # Look up existing records in a few IN queries instead of one SELECT per row
+        existing = {}
+        for i in range(0, len(unique_keys), 500):
+            chunk = unique_keys[i:i + 500]
+            for record in session.query(ElectricianDB).filter(ElectricianDB.unique_key.in_(chunk)):
+                existing[record.unique_key] = record
+        
+        new_records = []
+        for electrician, unique_key in zip(electricians, unique_keys):
+            record = existing.get(unique_key)
+            
+            if record is not None:
+                if update_existing:
+                    # Update existing record with new data
+                    db_record = ElectricianDB.from_electrician(electrician)
+                    for key in ["name", "address", "rating", "review_count", "source_url"]:
+                        if getattr(db_record, key):
+                            setattr(record, key, getattr(db_record, key))
+                    record.scraped_at = datetime.utcnow()
+            else:
+                # Insert new record
+                db_record = ElectricianDB.from_electrician(electrician)
+                existing[unique_key] = db_record
+                new_records.append(db_record)
+        
+        session.add_all(new_records)
+        return len(new_records)
+    
     def load_from_database(
         self,
         city: str = None,
@@ -288,8 +406,12 @@ class DataStorage:
         finally:
             session.close()
     
-    def export_to_excel(self, filename: str = None) -> str:
-        """Export all data to Excel file."""
+    def export_to_excel(
+        self,
+        filename: str = None,
+        electricians: Optional[List[Electrician]] = None,
+    ) -> str:
+        """Export electricians (all records by default) to Excel file."""
         import pandas as pd
         
         if not filename:
@@ -298,7 +420,8 @@ class DataStorage:
         
         filepath = self.output_dir / filename
         
-        electricians = self.load_from_database()
+        if electricians is None:
+            electricians = self.load_from_database()
         df = pd.DataFrame([e.to_dict() for e in electricians])
         
         # Convert services list to string
@@ -0,0 +1,181 @@
+"""
+Tests that the keyword-bitmask categorizer matches the original if/elif rules,
+with the Aho-Corasick automaton and with the pure-Python fallback.
+"""
+import importlib
+import random
+import sys
+
+import pytest
+
+import categorize_records
+
+# The original rules, one if/elif branch per category, in priority order
+OLD_RULES = [
+    (['meter', 'metering', 'prepaid', 'energy meter', 'utility'], (
+        "Meter Installer",
+        "Specializes in energy meter installation and maintenance",
+        95,
+        "High fit - Direct experience with meter installation. Likely familiar with utility requirements and protocols.",
+    )),
+    (['contractor', 'contracting', 'project', 'turnkey', 'commercial'], (
+        "Electrical Contractor",
+        "Electrical contracting and project work",
+        80,
+        "Good fit - Contractors often handle utility-scale projects and can manage smart meter rollouts.",
+    )),
+    (['industrial', 'factory', 'plant', 'manufacturing', 'hv', 'high voltage'], (
+        "Industrial Electrician",
+        "Industrial electrical systems and high-voltage work",
+        75,
+        "Good fit - Strong technical skills for complex installations. May need training on specific meter models.",
+    )),
+    (['engineer', 'consultant', 'solution', 'technical'], (
+        "Electrical Contractor",
+        "Electrical engineering and consulting services",
+        70,
+        "Moderate fit - Technical knowledge is strong but may focus more on design than installation.",
+    )),
+    (['ac ', 'air condition', 'hvac', 'cooling', 'refrigeration'], (
+        "AC Electrician",
+        "Air conditioning and HVAC electrical work",
+        45,
+        "Lower fit - Specialized in HVAC systems. Would need training for meter installation.",
+    )),
+    (['solar', 'renewable', 'panel', 'photovoltaic', 'inverter'], (
+        "Solar Installation",
+        "Solar panel and renewable energy installation",
+        70,
+        "Good fit - Experience with grid connections and metering for net metering. Familiar with utility requirements.",
+    )),
+    (['house', 'home', 'residential', 'domestic', 'wiring', 'rewiring'], (
+        "House Wiring",
+        "Residential wiring and electrical repairs",
+        55,
+        "Moderate fit - Basic electrical skills but may need training on smart meter protocols.",
+    )),
+    (['lineman', 'linemen', 'line work', 'utility', 'power line'], (
+        "Electrical Lineman",
+        "Power line installation and maintenance",
+        85,
+        "High fit - Experienced with utility infrastructure. Ideal for meter installation at service points.",
+    )),
+]
+
+OLD_DEFAULT = (
+    "Electrician",
+    "General electrical services and repairs",
+    50,
+    "Moderate fit - General electrical experience. Training on smart meters would be required.",
+)
+
+
+def old_categorize_business(name, services=None):
+    """categorize_business as it was before the keyword-bitmask rewrite."""
+    name_lower = name.lower() if name else ''
+    services_text = ' '.join(services or []).lower()
+    combined = f"{name_lower} {services_text}"
+
+    for keywords, payload in OLD_RULES:
+        if any(word in combined for word in keywords):
+            category, description, score, notes = payload
+            break
+    else:
+        category, description, score, notes = OLD_DEFAULT
+
+    if any(word in combined for word in ['certified', 'licensed', 'approved', 'authorized']):
+        score = min(score + 10, 100)
+        notes += " Certified/licensed professional."
+
+    if any(word in combined for word in ['government', 'govt', 'discom', 'utility approved']):
+        score = min(score + 15, 100)
+        notes += " Has government/utility experience."
+
+    if any(word in combined for word in ['repair only', 'fan', 'light', 'appliance']):
+        score = max(score - 15, 10)
+        notes += " May focus on small repairs."
+
+    return category, description, score, notes
+
+
+KEYWORDS = sorted(
+    {word for keywords, _ in OLD_RULES for word in keywords}
+    | {'certified', 'licensed', 'approved', 'authorized'}
+    | {'government', 'govt', 'discom', 'utility approved'}
+    | {'repair only', 'fan', 'light', 'appliance'}
+)
+FILLER = ['electrician', 'services', 'sharma', 'electricals', 'surat', 'and', '&', 'pvt ltd', 'repair', 'ac', '']
+
+
+def sample_inputs():
+    """Hand-picked edge cases plus random mixes of keywords and filler words."""
+    cases = [
+        ("", None),
+        (None, None),
+        ("Sharma Electricals", []),
+        ("AC", None),  # 'ac ' needs the trailing space the name/services join adds
+        ("Cool AC", ["Repair"]),
+        ("Hotel Wiring", ["Fan Fitting"]),
+        ("UTILITY APPROVED Linemen", ["Prepaid Meter"]),
+        ("Lineman Services", ["Power Line", "Licensed"]),
+        ("Highway Electricals", ["Chvac"]),
+    ]
+    rng = random.Random(0)
+    for _ in range(3000):
+        words = rng.sample(KEYWORDS, rng.randint(0, 4)) + rng.sample(FILLER, rng.randint(0, 3))
+        rng.shuffle(words)
+        split = rng.randint(0, len(words))
+        name = " ".join(w.title() if rng.random() < 0.5 else w for w in words[:split])
+        cases.append((name, words[split:]))
+    return cases
+
+
+@pytest.fixture(params=["ahocorasick", "fallback"])
+def categorizer(request, monkeypatch):
+    """categorize_records loaded with the Aho-Corasick automaton, or without it."""
+    if request.param == "ahocorasick":
+        pytest.importorskip("ahocorasick")
+    else:
+        # A None entry makes `import ahocorasick` raise ImportError
+        monkeypatch.setitem(sys.modules, "ahocorasick", None)
+    module = importlib.reload(categorize_records)
+    assert module.HAS_AHOCORASICK == (request.param == "ahocorasick")
+    yield module
+    monkeypatch.undo()
+    importlib.reload(categorize_records)
+
+
+def test_categorize_business_matches_old_rules(categorizer):
+    for name, services in sample_inputs():
+        assert categorizer.categorize_business(name, services) == old_categorize_business(name, services), (name, services)
+
+
+def test_rule_priority(categorizer):
+    # 'utility' is in both the meter and lineman rules; the earlier rule wins
+    assert categorizer.categorize_business("Utility Lineman")[0] == "Meter Installer"
+    assert categorizer.categorize_business("Solar Home Wiring")[0] == "Solar Installation"
+    assert categorizer.categorize_business("Sharma Electricals")[0] == "Electrician"
+
+
+def test_score_adjustments(categorizer):
+    category, _, score, notes = categorizer.categorize_business("Govt Approved Meter Works")
+    assert (category, score) == ("Meter Installer", 100)
+    assert notes.endswith(" Certified/licensed professional. Has government/utility experience.")
+
+    _, _, score, notes = categorizer.categorize_business("Fan and Light Repair")
+    assert score == 35
+    assert notes.endswith(" May focus on small repairs.")
+
+
+@pytest.mark.parametrize("services_json, expected", [
+    ('["Wiring", "Meter Repair"]', "wiring meter repair"),
+    ('[]', ""),
+    ("", ""),
+    (None, ""),
+    ("Panel Work", "panel work"),
+    ('"Panel Work"', '"panel work"'),
+    ('{"a": 1}', '{"a": 1}'),
+    ("42", "42"),
+])
+def test_services_text(services_json, expected):
+    assert categorize_records.services_text(services_json) == expected
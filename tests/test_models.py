@@ -0,0 +1,18 @@
+"""
+Tests for the Electrician dataclass conversions.
+"""
+from src.models import Electrician
+
+
+def test_to_dict_copies_services():
+    electrician = Electrician(name="A", phone="9825012345", city="Surat", state="Gujarat", source="test", services=["Wiring"])
+    data = electrician.to_dict()
+    data["services"].append("Meter")
+
+    assert electrician.services == ["Wiring"]
+    assert Electrician.from_dict(electrician.to_dict()) == electrician
+
+
+def test_to_dict_without_services():
+    electrician = Electrician(name="A", phone="9825012345", city="Surat", state="Gujarat", source="test", services=None)
+    assert electrician.to_dict()["services"] == []
@@ -0,0 +1,71 @@
+"""
+Tests for the shared phone number parsing in src.scrapers.
+"""
+import pytest
+
+from src.scrapers import PHONE_RE, extract_phones, has_phone_hint, normalize_phone
+
+
+@pytest.mark.parametrize("text", [
+    "+919825012345",
+    "+91 9825012345",
+    "+91-98250-12345",
+    "91 98250 12345",
+    "09825012345",
+    "098250-12345",
+    "9825012345",
+    "98250 12345",
+    "98250-12345",
+])
+def test_extract_phones_formats(text):
+    assert extract_phones(f"Call {text} now") == ["9825012345"]
+
+
+def test_extract_phones_rejects_non_mobile_numbers():
+    assert extract_phones("Landline 02612345678, pin 395007, id 5825012345") == []
+
+
+def test_extract_phones_keeps_page_order_without_duplicates():
+    text = "7000011111 / 98250 12345 / +91 70000 11111 / 9825012345 / 6000022222"
+    assert extract_phones(text) == ["7000011111", "9825012345", "6000022222"]
+
+
+def test_extract_phones_adjacent_digit_runs():
+    # Text nodes joined without a separator
+    assert extract_phones("9176543210" + "45") == ["7654321045", "9176543210"]
+    assert extract_phones("919825012345") == ["9825012345", "9198250123"]
+    assert extract_phones("Ph: 9825012345" + "7000011111") == ["9825012345", "7000011111"]
+
+
+def test_extract_phones_no_prefix_inside_digit_run():
+    assert extract_phones("12917654321045") == ["9176543210"]
+
+
+def test_normalize_phone_drops_separator():
+    assert [normalize_phone(m) for m in PHONE_RE.findall("98250 12345 98250-12345 9825012345")] == [
+        "9825012345", "9825012345", "9825012345",
+    ]
+
+
+@pytest.mark.parametrize("text", [
+    "+91 98250-12345",
+    "91-98250 12345",
+    "0 98250 12345",
+    "098250-12345",
+    "9825012345",
+])
+def test_has_phone_hint_accepts_every_phone_format(text):
+    # [6-9]\d{4} comes before any separator PHONE_RE allows
+    assert extract_phones(text) == ["9825012345"]
+    assert has_phone_hint(text.encode())
+
+
+@pytest.mark.parametrize("content, expected", [
+    (b"<span>98250 12345</span>", True),
+    (b"<a href='tel:+919825012345'>call</a>", True),
+    (b"<b>98250</b><b>12345</b>", True),
+    (b"<p>Access denied</p>", False),
+    (b"<p>02612 34567</p>", False),
+])
+def test_has_phone_hint(content, expected):
+    assert has_phone_hint(content) is expected
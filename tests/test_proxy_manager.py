@@ -0,0 +1,108 @@
+"""
+Tests for ProxyManager rotation, eviction and thread safety.
+"""
+import random
+import threading
+import time
+
+from src.proxy_manager import Proxy, ProxyManager
+
+
+def make_proxies(count):
+    return [Proxy(host=f"10.0.0.{i}", port=8080) for i in range(count)]
+
+
+def test_mark_failure_evicts_after_max_failures():
+    proxies = make_proxies(2)
+    manager = ProxyManager(proxies, min_delay_between_uses=0, max_failures=3)
+
+    for _ in range(2):
+        manager.mark_failure(proxies[0])
+    assert manager.count == 2
+
+    manager.mark_failure(proxies[0])
+    assert list(manager.proxies) == [proxies[1]]
+
+    # A late failure from a request already in flight must not raise
+    manager.mark_failure(proxies[0])
+    assert list(manager.proxies) == [proxies[1]]
+
+
+def test_mark_success_offsets_failures():
+    proxy = make_proxies(1)[0]
+    manager = ProxyManager([proxy], min_delay_between_uses=0, max_failures=2)
+
+    manager.mark_failure(proxy)
+    manager.mark_success(proxy)
+    manager.mark_failure(proxy)
+    assert manager.count == 1
+
+
+def test_get_proxy_round_robin():
+    proxies = make_proxies(3)
+    manager = ProxyManager(proxies, min_delay_between_uses=0)
+
+    assert [manager.get_proxy() for _ in range(6)] == proxies * 2
+
+
+def test_get_proxy_skips_proxies_not_ready():
+    busy, ready = make_proxies(2)
+    manager = ProxyManager([busy, ready], rotation_strategy="random", min_delay_between_uses=60)
+    busy.last_used = time.monotonic()
+
+    for _ in range(20):
+        ready.last_used = time.monotonic() - 120
+        assert manager.get_proxy() is ready
+
+
+def test_get_proxy_empty_pool():
+    assert ProxyManager().get_proxy() is None
+
+
+def test_record_latency_orders_scores():
+    fast, slow = make_proxies(2)
+    for _ in range(10):
+        fast.record_latency(0.1)
+        slow.record_latency(3.0)
+
+    assert fast.latency_ewma < 0.2 < 2.5 < slow.latency_ewma
+    assert fast.score > slow.score
+
+
+def test_weighted_rotation_prefers_fast_proxies():
+    fast, slow = make_proxies(2)
+    manager = ProxyManager([fast, slow], rotation_strategy="weighted", min_delay_between_uses=0)
+    for _ in range(10):
+        manager.mark_success(fast, elapsed=0.1)
+        manager.mark_success(slow, elapsed=3.0)
+
+    random.seed(0)
+    picks = [manager.get_proxy() for _ in range(200)]
+    assert picks.count(fast) > 3 * picks.count(slow)
+
+
+def test_concurrent_get_proxy_and_mark_failure():
+    proxies = make_proxies(10)
+    manager = ProxyManager(proxies, min_delay_between_uses=0, max_failures=20)
+    errors = []
+
+    def worker():
+        try:
+            while True:
+                proxy = manager.get_proxy()
+                if proxy is None:
+                    return
+                manager.mark_failure(proxy)
+        except Exception as e:  # pragma: no cover - surfaced by the assert below
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=30)
+
+    assert not errors
+    assert not any(thread.is_alive() for thread in threads)
+    assert manager.count == 0
+    assert all(proxy.fail_count >= 20 for proxy in proxies)
@@ -0,0 +1,135 @@
+"""
+Tests for DataStorage's database write paths, against a temporary SQLite database.
+"""
+import pytest
+
+from src.models import Electrician, make_unique_key
+from src.storage import DataStorage, ElectricianDB
+
+
+@pytest.fixture
+def storage(tmp_path):
+    return DataStorage(output_dir=tmp_path, database_url=f"sqlite:///{tmp_path / 'test.db'}")
+
+
+def make_electrician(phone, city="Surat", state="Gujarat", **kwargs):
+    kwargs.setdefault("name", f"Electrician {phone}")
+    return Electrician(phone=phone, city=city, state=state, source="test", **kwargs)
+
+
+def make_row(phone, city="Surat", state="Gujarat", **kwargs):
+    row = {"name": f"Electrician {phone}", "phone": phone, "city": city, "state": state, "source": "test"}
+    row.update(kwargs)
+    return row
+
+
+def count_records(storage, **filters):
+    session = storage.Session()
+    try:
+        return session.query(ElectricianDB).filter_by(**filters).count()
+    finally:
+        session.close()
+
+
+def test_save_to_database_skips_duplicates(storage):
+    electricians = [
+        make_electrician("9876543210"),
+        make_electrician("9876543211"),
+        # Same phone, city and state as the first record
+        make_electrician("+91 98765 43210"),
+    ]
+    assert storage.save_to_database(electricians) == 2
+    assert count_records(storage) == 2
+
+    # Nothing new the second time round
+    assert storage.save_to_database(electricians) == 0
+    assert count_records(storage) == 2
+
+    # Same phone in another city is a different record
+    assert storage.save_to_database([make_electrician("9876543210", city="Pune", state="Maharashtra")]) == 1
+    assert count_records(storage) == 3
+
+
+def test_save_to_database_updates_existing(storage):
+    storage.save_to_database([make_electrician("9876543210", name="Old Name")])
+
+    assert storage.save_to_database([make_electrician("9876543210", name="New Name", rating=4.5)]) == 0
+    [record] = storage.load_from_database()
+    assert (record.name, record.rating) == ("New Name", 4.5)
+
+    storage.save_to_database([make_electrician("9876543210", name="Ignored")], update_existing=False)
+    [record] = storage.load_from_database()
+    assert record.name == "New Name"
+
+
+def test_save_to_database_counts_across_lookup_chunks(storage):
+    # More records than one IN lookup holds, so existing keys span chunks
+    phones = [f"98{i:08d}" for i in range(1200)]
+    assert storage.save_to_database([make_electrician(p) for p in phones]) == 1200
+
+    more = [make_electrician(p) for p in phones + [f"97{i:08d}" for i in range(5)]]
+    assert storage.save_to_database(more) == 5
+    assert count_records(storage) == 1205
+
+
+def test_bulk_insert_dicts_skips_duplicates(storage):
+    storage.save_to_database([make_electrician("9876543210")])
+
+    rows = [
+        make_row("9876543210"),  # already in the database
+        make_row("9876543211"),
+        make_row("9876543211"),  # repeated within the batch
+        make_row("9876543212", unique_key="custom-key"),
+    ]
+    assert storage.bulk_insert_dicts(rows) == 2
+    assert count_records(storage) == 3
+
+    # Rows without a unique_key get the same key save_to_database uses
+    assert count_records(storage, unique_key=make_unique_key("9876543211", "Surat", "Gujarat")) == 1
+    assert count_records(storage, unique_key="custom-key") == 1
+
+    assert storage.bulk_insert_dicts(rows) == 0
+    assert storage.bulk_insert_dicts([]) == 0
+
+
+def test_bulk_insert_dicts_fills_defaults(storage):
+    storage.bulk_insert_dicts([make_row("9876543210", services=["wiring", "meter"])])
+
+    session = storage.Session()
+    try:
+        record = session.query(ElectricianDB).one()
+        assert record.verified is False
+        assert record.smart_meter_score == 0
+        assert record.scraped_at is not None
+        assert record.to_electrician().services == ["wiring", "meter"]
+    finally:
+        session.close()
+
+
+def test_replace_city_records(storage):
+    storage.save_to_database([
+        make_electrician("9876543210"),
+        make_electrician("9876543211", city="SURAT"),
+        make_electrician("9876543212", city="Pune", state="Maharashtra"),
+    ])
+
+    # City matching ignores case; other cities are left alone
+    deleted, saved = storage.replace_city_records("surat", [
+        make_row("9876543211", name="Replaced"),
+        make_row("9876543213"),
+    ])
+    assert (deleted, saved) == (2, 2)
+
+    surat = {e.phone: e.name for e in storage.load_from_database(city="Surat")}
+    assert surat == {"9876543211": "Replaced", "9876543213": "Electrician 9876543213"}
+    assert count_records(storage, city="Pune") == 1
+
+
+def test_replace_city_records_rolls_back_on_error(storage):
+    storage.save_to_database([make_electrician("9876543210")])
+
+    # name is NOT NULL, so the insert fails after the delete has run
+    with pytest.raises(Exception):
+        storage.replace_city_records("Surat", [make_row("9876543211", name=None)])
+
+    assert [e.phone for e in storage.load_from_database(city="Surat")] == ["9876543210"]